@@ -1,29 +1,79 @@
 """Control Freak eDIDIO Home Assistant integration."""
 
+import asyncio
 import logging
 
 from edidio_control_py import EdidioClient
 from edidio_control_py.exceptions import EDIDIOConnectionError, EDIDIOTimeoutError
 
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
-
-from .const import CONF_HOST, CONF_PORT, DOMAIN
-
-PLATFORMS: list[Platform] = [Platform.LIGHT]  # Define platforms
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import (
+    CONF_HOST,
+    CONF_PORT,
+    CONNECTION_CHECK_INTERVAL,
+    MAX_RECONNECT_DELAY,
+    PLATFORMS,
+    SIGNAL_CONNECTION_STATE,
+    SIGNAL_LIGHTS_UPDATED,
+)
+from .models import EdidioConfigEntry, EdidioRuntimeData
 
 _LOGGER = logging.getLogger(__name__)
 
+# Backoff sleep, bound here so tests can replace it without patching asyncio
+_sleep = asyncio.sleep
+
 
-async def options_update_listener(hass: HomeAssistant, config_entry: ConfigEntry):
+async def options_update_listener(hass: HomeAssistant, config_entry: EdidioConfigEntry):
     """Handle options update."""
-    _LOGGER.info("Control Freak options updated, reloading integration")
-    # This will call async_unload_entry and then async_setup_entry again
-    await hass.config_entries.async_reload(config_entry.entry_id)
+    client = config_entry.runtime_data.client
+    if (client.host, client.port) != (
+        config_entry.data.get(CONF_HOST),
+        config_entry.data.get(CONF_PORT),
+    ):
+        _LOGGER.info("Control Freak connection changed, reloading integration")
+        # This will call async_unload_entry and then async_setup_entry again
+        await hass.config_entries.async_reload(config_entry.entry_id)
+        return
+
+    # Only the lights changed, so keep the open connection and let the light
+    # platform add, remove or re-create the affected entities
+    _LOGGER.info("Control Freak options updated, refreshing lights")
+    async_dispatcher_send(hass, f"{SIGNAL_LIGHTS_UPDATED}_{config_entry.entry_id}")
+
+
+async def _async_connect_with_backoff(
+    client: EdidioClient, host: str, port: int
+) -> None:
+    """Connect to the eDIDIO device, retrying with exponential backoff."""
+    attempt = 0
+    while True:
+        try:
+            await client.connect()
+        except (EDIDIOConnectionError, EDIDIOTimeoutError) as e:
+            delay = min(MAX_RECONNECT_DELAY, 2**attempt)
+            # Only warn on the first failure to avoid flooding the log
+            log = _LOGGER.warning if attempt == 0 else _LOGGER.debug
+            log(
+                "Connection to Control Freak device failed (%s:%s): %s. "
+                "Retrying in %s seconds",
+                host,
+                port,
+                e,
+                delay,
+            )
+            if delay < MAX_RECONNECT_DELAY:
+                attempt += 1
+            await _sleep(delay)
+        else:
+            _LOGGER.info("Successfully connected to eDIDIO device at %s:%s", host, port)
+            return
 
 
-async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+async def async_setup_entry(hass: HomeAssistant, entry: EdidioConfigEntry) -> bool:
     """Set up Control Freak from a config entry."""
     host = entry.data.get(CONF_HOST)
     port = entry.data.get(CONF_PORT)
@@ -37,30 +87,43 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Instantiate EdidioClient
     client = EdidioClient(host, port)
 
-    # Attempt to connect to the device.
-    try:
-        await client.connect()
-        _LOGGER.info("Successfully connected to eDIDIO device at %s:%s", host, port)
-    except (EDIDIOConnectionError, EDIDIOTimeoutError) as e:
-        _LOGGER.warning(
-            "Initial connection to Control Freak device failed (%s:%s): %s. "
-            "The integration will attempt to reconnect when needed",
-            host,
-            port,
-            e,
+    signal_connection_state = f"{SIGNAL_CONNECTION_STATE}_{entry.entry_id}"
+    was_connected = False
+    # Only one reconnect loop runs at a time, even if the connection flaps
+    reconnect_task: asyncio.Task[None] | None = None
+
+    @callback
+    def _async_check_connection(_now=None) -> None:
+        """Push the connection state to the lights, reconnecting if it dropped."""
+        nonlocal was_connected, reconnect_task
+        connected = client.connected
+        if was_connected and not connected:
+            _LOGGER.warning("Lost connection to Control Freak device %s:%s", host, port)
+            if reconnect_task is None or reconnect_task.done():
+                reconnect_task = entry.async_create_background_task(
+                    hass, _async_connect(), name="edidio_reconnect"
+                )
+        was_connected = connected
+        async_dispatcher_send(hass, signal_connection_state, connected)
+
+    async def _async_connect() -> None:
+        """Connect with backoff, then push the new connection state."""
+        await _async_connect_with_backoff(client, host, port)
+        _async_check_connection()
+
+    # Connect in the background so an unreachable device does not stall startup.
+    # The task is cancelled automatically when the entry is unloaded.
+    entry.async_create_background_task(hass, _async_connect(), name="edidio_connect")
+    entry.async_on_unload(
+        async_track_time_interval(
+            hass, _async_check_connection, CONNECTION_CHECK_INTERVAL
         )
-
-    hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN][entry.entry_id] = {
-        "client": client,
-        "config_entry": entry,
-    }
-    _LOGGER.debug(
-        "Control Freak integration data stored for %s: %s",
-        entry.entry_id,
-        hass.data[DOMAIN][entry.entry_id],
     )
 
+    entry.runtime_data = EdidioRuntimeData(client=client, config_entry=entry)
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        _LOGGER.debug("Control Freak client stored for %s", entry.entry_id)
+
     # Register the options update listener
     entry.async_on_unload(entry.add_update_listener(options_update_listener))
 
@@ -70,27 +133,16 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return True
 
 
-async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+async def async_unload_entry(hass: HomeAssistant, entry: EdidioConfigEntry) -> bool:
     """Unload a config entry."""
-    _LOGGER.debug(
-        "Unloading Control Freak integration for entry_id: %s", entry.entry_id
-    )
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        _LOGGER.debug(
+            "Unloading Control Freak integration for entry_id: %s", entry.entry_id
+        )
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
     if unload_ok:
-        domain_data = hass.data[DOMAIN].pop(entry.entry_id, None)
-        if domain_data and (client := domain_data.get("client")):
-            await client.disconnect()
-            _LOGGER.info(
-                "Control Freak client disconnected and data removed for %s",
-                entry.entry_id,
-            )
+        await entry.runtime_data.client.disconnect()
+        _LOGGER.info("Control Freak client disconnected for %s", entry.entry_id)
 
     return unload_ok
-
-
-async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
-    """Reload a config entry."""
-    _LOGGER.debug("Reloading Control Freak config entry: %s", entry.entry_id)
-    await async_unload_entry(hass, entry)
-    await async_setup_entry(hass, entry)
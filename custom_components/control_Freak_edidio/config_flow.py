@@ -1,8 +1,12 @@
 """Config Flow for Control Freak eDIDIO integration with Home Assistant."""
 
+import asyncio
 import logging
-import uuid
+import time
+from typing import TYPE_CHECKING
 
+from edidio_control_py import EdidioClient
+from edidio_control_py.exceptions import EDIDIOConnectionError, EDIDIOTimeoutError
 import voluptuous as vol
 
 from homeassistant import config_entries
@@ -10,6 +14,7 @@ from homeassistant.core import callback
 from homeassistant.helpers import selector
 
 from .const import (
+    BULK_LIGHTS_THRESHOLD,
     CONF_HOST,
     CONF_LIGHT_ADDRESS,
     CONF_LIGHT_ID,
@@ -18,13 +23,109 @@ from .const import (
     CONF_LIGHT_PROTOCOL,
     CONF_LIGHTS,
     CONF_PORT,
+    DEFAULT_PORT,
     DOMAIN,
+    ERROR_CANNOT_CONNECT,
+    ERROR_DUPLICATE_LIGHT_NAME,
+    ERROR_INVALID_LIGHTS,
+    ERROR_WRONG_LIGHT_COUNT,
+    PROBE_CACHE_TTL,
+    PROBE_TIMEOUT,
     PROTOCOLS,
 )
-from .options_flow import ControlFreakOptionsFlowHandler
+
+if TYPE_CHECKING:
+    from .options_flow import ControlFreakOptionsFlowHandler
 
 _LOGGER = logging.getLogger(__name__)  # Add logger for debug messages
 
+# Form schemas are static, so they are built once at import
+_USER_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_HOST): str,
+        vol.Required(CONF_PORT, default=DEFAULT_PORT): int,
+        vol.Required("num_lights", default=1): vol.All(
+            vol.Coerce(int), vol.Range(min=1)
+        ),
+    }
+)
+
+_LIGHT_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_LIGHT_NAME): str,
+        vol.Required(CONF_LIGHT_ADDRESS): vol.All(
+            vol.Coerce(int), vol.Range(min=0)
+        ),  # Validate address
+        vol.Required(CONF_LIGHT_PROTOCOL): selector.SelectSelector(
+            selector.SelectSelectorConfig(
+                options=PROTOCOLS,
+                mode=selector.SelectSelectorMode.DROPDOWN,
+            )
+        ),
+        vol.Required(CONF_LIGHT_LINE, default=1): vol.All(
+            vol.Coerce(int), vol.Range(min=1)
+        ),
+    }
+)
+
+_LIGHTS_BULK_FORM_SCHEMA = vol.Schema(
+    {vol.Required(CONF_LIGHTS): selector.ObjectSelector()}
+)
+
+# Validates each row submitted through the bulk lights form
+_BULK_LIGHTS_SCHEMA = vol.Schema(
+    vol.All(
+        [
+            vol.Schema(
+                {
+                    vol.Required(CONF_LIGHT_NAME): str,
+                    vol.Required(CONF_LIGHT_ADDRESS): vol.All(
+                        vol.Coerce(int), vol.Range(min=0)
+                    ),
+                    vol.Required(CONF_LIGHT_PROTOCOL): vol.In(PROTOCOLS),
+                    vol.Optional(CONF_LIGHT_LINE, default=1): vol.All(
+                        vol.Coerce(int), vol.Range(min=1)
+                    ),
+                }
+            )
+        ],
+        vol.Length(min=1),
+    )
+)
+
+
+# Monotonic time of the last successful probe of each (host, port). Kept at
+# module level, as the integration keeps no state in hass.data.
+_PROBE_CACHE: dict[tuple[str, int], float] = {}
+
+
+async def _async_probe_connection(host: str, port: int) -> bool:
+    """Return True if the eDIDIO device at host:port accepts a connection.
+
+    Successful probes are cached for PROBE_CACHE_TTL seconds so that a
+    repeated flow for the same device does not connect again.
+    """
+    probe_key = (host, port)
+    last_success = _PROBE_CACHE.get(probe_key)
+    if last_success is not None and time.monotonic() - last_success < PROBE_CACHE_TTL:
+        _LOGGER.debug(
+            "Skipping connection probe for %s:%s, recently verified", host, port
+        )
+        return True
+
+    client = EdidioClient(host, port)
+    try:
+        async with asyncio.timeout(PROBE_TIMEOUT):
+            await client.connect()
+    except (EDIDIOConnectionError, EDIDIOTimeoutError, TimeoutError) as err:
+        _LOGGER.debug("Connection probe to %s:%s failed: %s", host, port, err)
+        return False
+    finally:
+        await client.disconnect()
+
+    _PROBE_CACHE[probe_key] = time.monotonic()
+    return True
+
 
 class ControlFreakConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Control Freak eDIDIO Config Flow."""
@@ -36,54 +137,68 @@ class ControlFreakConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         self.lights = []  # List to store light configurations during initial setup
         self._host = None
         self._port = None
+        self._unique_id = None
+        self._title = None
         self._num_lights = 0
         self._current_light_index = 0
 
     async def async_step_user(self, user_input=None):
         """Step 1: Gather general information like host, port, and number of lights."""
+        errors = {}
         if user_input is not None:
             self._host = user_input[CONF_HOST]
             self._port = user_input[CONF_PORT]
-            self._num_lights = user_input["num_lights"]
-            self._current_light_index = 0  # Start at the first light
+            self._unique_id = f"{self._host}-{self._port}"
+            self._title = f"Control Freak ({self._host}:{self._port})"
+            # Abort before asking for any lights if this device is already set up
+            await self.async_set_unique_id(self._unique_id)
+            self._abort_if_unique_id_configured()  # Check for existing entry
 
-            # If no lights to configure, create entry directly
-            if self._num_lights == 0:
-                await self.async_set_unique_id(f"{self._host}-{self._port}")
-                self._abort_if_unique_id_configured()  # Check for existing entry
-
-                return self.async_create_entry(
-                    title=f"Control Freak ({self._host}:{self._port})",
-                    data={
-                        CONF_HOST: self._host,
-                        CONF_PORT: self._port,
-                    },
-                    options={
-                        CONF_LIGHTS: [],  # Empty list of lights
-                    },
-                )
-            # Proceed to configure the first light
-            return await self.async_step_light_details()
+            # Catch an unreachable device now rather than at setup time
+            if not await _async_probe_connection(self._host, self._port):
+                errors["base"] = ERROR_CANNOT_CONNECT
+            else:
+                # Only kept once the device is known to be reachable
+                self._num_lights = user_input["num_lights"]
+                self._current_light_index = 0  # Start at the first light
+                # If no lights to configure, create entry directly
+                if self._num_lights == 0:
+                    return self.async_create_entry(
+                        title=self._title,
+                        data={
+                            CONF_HOST: self._host,
+                            CONF_PORT: self._port,
+                        },
+                        options={
+                            CONF_LIGHTS: [],  # Empty list of lights
+                        },
+                    )
+                # Many lights are entered in a single form instead of one form each
+                if self._num_lights > BULK_LIGHTS_THRESHOLD:
+                    return await self.async_step_lights_bulk()
+                # Proceed to configure the first light
+                return await self.async_step_light_details()
 
         return self.async_show_form(
             step_id="user",
-            data_schema=vol.Schema(
-                {
-                    vol.Required(CONF_HOST): str,
-                    vol.Required(CONF_PORT, default=23): int,
-                    vol.Required("num_lights", default=1): vol.All(
-                        vol.Coerce(int), vol.Range(min=1)
-                    ),
-                }
+            # Shown again after an error with what the user entered
+            data_schema=(
+                self.add_suggested_values_to_schema(_USER_SCHEMA, user_input)
+                if user_input is not None
+                else _USER_SCHEMA
             ),
+            errors=errors,
         )
 
     async def async_step_light_details(self, user_input=None):
         """Step 2: Gather details for each light (name, address, protocol, line)."""
         # If user input is provided, save the current light details
         if user_input is not None:
+            # Imported here as IDs are only needed once lights are submitted
+            import uuid
+
             # Generate a stable ID for the light before adding it to the list
-            light_id = str(uuid.uuid4())  # Generate a new UUID
+            light_id = uuid.uuid4().hex  # Generate a new UUID
             _LOGGER.debug(
                 "Generated stable ID for light '%s': %s",
                 user_input[CONF_LIGHT_NAME],
@@ -105,23 +220,7 @@ class ControlFreakConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             # If more lights to configure, show form for the next light
             return self.async_show_form(
                 step_id="light_details",
-                data_schema=vol.Schema(
-                    {
-                        vol.Required(CONF_LIGHT_NAME): str,
-                        vol.Required(CONF_LIGHT_ADDRESS): vol.All(
-                            vol.Coerce(int), vol.Range(min=0)
-                        ),  # Validate address
-                        vol.Required(CONF_LIGHT_PROTOCOL): selector.SelectSelector(
-                            selector.SelectSelectorConfig(
-                                options=PROTOCOLS,
-                                mode=selector.SelectSelectorMode.DROPDOWN,
-                            )
-                        ),
-                        vol.Required(CONF_LIGHT_LINE, default=1): vol.All(
-                            vol.Coerce(int), vol.Range(min=1)
-                        ),
-                    }
-                ),
+                data_schema=_LIGHT_SCHEMA,
                 # Use description_placeholders to guide the user
                 description_placeholders={
                     "light_number": self._current_light_index + 1,
@@ -130,12 +229,8 @@ class ControlFreakConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 },
             )
         # All lights configured, finish and create the configuration entry
-        # Ensure we also call async_set_unique_id for the config entry itself
-        await self.async_set_unique_id(f"{self._host}-{self._port}")
-        self._abort_if_unique_id_configured()  # Check for existing entry
-
         return self.async_create_entry(
-            title=f"Control Freak ({self._host}:{self._port})",
+            title=self._title,
             data={
                 CONF_HOST: self._host,
                 CONF_PORT: self._port,
@@ -145,10 +240,61 @@ class ControlFreakConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             },
         )
 
+    async def async_step_lights_bulk(self, user_input=None):
+        """Step 2 (bulk): Gather the details of every light in one submission."""
+        errors = {}
+        if user_input is not None:
+            try:
+                lights = _BULK_LIGHTS_SCHEMA(user_input[CONF_LIGHTS])
+            except vol.Invalid as err:
+                _LOGGER.debug("Invalid bulk lights submitted: %s", err)
+                errors["base"] = ERROR_INVALID_LIGHTS
+            else:
+                # The form asks for exactly the number of lights given in the
+                # user step, and names must be unique like in the options flow
+                if len(lights) != self._num_lights:
+                    errors["base"] = ERROR_WRONG_LIGHT_COUNT
+                elif len({light[CONF_LIGHT_NAME] for light in lights}) != len(lights):
+                    errors["base"] = ERROR_DUPLICATE_LIGHT_NAME
+
+            if not errors:
+                import uuid
+
+                # Assign every stable ID in one pass over the submitted rows
+                self.lights = [
+                    {**light, CONF_LIGHT_ID: uuid.uuid4().hex} for light in lights
+                ]
+                _LOGGER.debug("Configured %d lights in bulk", len(self.lights))
+
+                return self.async_create_entry(
+                    title=self._title,
+                    data={
+                        CONF_HOST: self._host,
+                        CONF_PORT: self._port,
+                    },
+                    options={
+                        CONF_LIGHTS: self.lights,
+                    },
+                )
+
+        return self.async_show_form(
+            step_id="lights_bulk",
+            data_schema=_LIGHTS_BULK_FORM_SCHEMA,
+            errors=errors,
+            description_placeholders={
+                "total_lights": self._num_lights,
+                "protocols": ", ".join(PROTOCOLS),
+                "step_title": "Add Lights",
+            },
+        )
+
     @staticmethod
     @callback
     def async_get_options_flow(
         config_entry: config_entries.ConfigEntry,
-    ) -> ControlFreakOptionsFlowHandler:
+    ) -> "ControlFreakOptionsFlowHandler":
         """Get the options flow for this handler."""
+        # Deferred so discovery and the initial setup flow skip loading it
+        from .options_flow import ControlFreakOptionsFlowHandler
+
         return ControlFreakOptionsFlowHandler(config_entry)
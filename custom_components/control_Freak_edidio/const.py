@@ -1,9 +1,28 @@
 """Constants for the Control Freak integration."""
 
+from datetime import timedelta
+from typing import Final
+
+from homeassistant.const import Platform
+
 DOMAIN = "control_freak_edidio"
+
+# Forwarded together with async_forward_entry_setups; never set up one by one
+PLATFORMS: Final = (Platform.LIGHT,)
 # Default values
 DEFAULT_PORT = 23
 DEFAULT_NUM_LIGHTS = 0
+# Above this many lights the config flow asks for all of them in one form
+BULK_LIGHTS_THRESHOLD = 3
+
+# Connection retry backoff (seconds)
+MAX_RECONNECT_DELAY = 300
+# How often the connection state is pushed to the light entities
+CONNECTION_CHECK_INTERVAL = timedelta(seconds=30)
+
+# Config flow connection probe (seconds)
+PROBE_TIMEOUT = 5
+PROBE_CACHE_TTL = 600
 
 # Protocols
 PROTOCOL_DALI_WHITE = "DALI White"
@@ -38,8 +57,15 @@ CONF_LIGHT_LINE = "line"
 
 CONF_LIGHT_ID = "light_id"
 
+# Dispatcher signals, suffixed with the config entry ID
+SIGNAL_LIGHTS_UPDATED = f"{DOMAIN}_lights_updated"
+SIGNAL_CONNECTION_STATE = f"{DOMAIN}_connection_state"
+
 # Error keys for config flow
 ERROR_CANNOT_CONNECT = "cannot_connect"
 ERROR_UNKNOWN = "unknown"
 ERROR_INVALID_ADDRESS_FORMAT = "invalid_address_format"
 ERROR_UNKNOWN_ADDRESS_ERROR = "unknown_address_error"
+ERROR_INVALID_LIGHTS = "invalid_lights"
+ERROR_WRONG_LIGHT_COUNT = "wrong_light_count"
+ERROR_DUPLICATE_LIGHT_NAME = "duplicate_light_name"
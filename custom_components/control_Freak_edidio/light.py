@@ -1,5 +1,7 @@
 """Light Object for Control Freak eDIDIO integration with Home Assistant."""
 
+from functools import lru_cache, partial
+from itertools import count
 import logging
 import uuid
 
@@ -16,13 +18,11 @@ from edidio_control_py.exceptions import (
 )
 
 from homeassistant.components.light import ColorMode, LightEntity
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.util.color import (
-    color_temperature_kelvin_to_mired,
-    color_temperature_mired_to_kelvin,
-)
+from homeassistant.util.color import color_temperature_kelvin_to_mired
 
 from .const import (
     CONF_LIGHT_ADDRESS,
@@ -40,98 +40,209 @@ from .const import (
     PROTOCOL_DMX_RGB,
     PROTOCOL_DMX_RGBW,
     PROTOCOL_DMX_WHITE,
+    SIGNAL_CONNECTION_STATE,
+    SIGNAL_LIGHTS_UPDATED,
 )
+from .models import EdidioConfigEntry
 
 _LOGGER = logging.getLogger(__name__)
 
+# HA brightness (0-255) times HA channel (0-255) maps onto 0-DALI_ARC_LEVEL_MAX
+_DALI_MAX = DALI_ARC_LEVEL_MAX
+_HA2_MAX = 255 * 255
 
-# --- Message ID Generator Function ---
-def get_message_id_generator():
-    """Return a function that generates incrementing message IDs.
+# DALI arc level for every HA brightness (0-255)
+_ARC_LUT = tuple(int(b / 255.0 * DALI_ARC_LEVEL_MAX) for b in range(256))
 
-    Each call to the returned function will increment the ID.
-    """
+# Protocols addressed over DMX rather than DALI
+_DMX_PROTOCOLS = frozenset({PROTOCOL_DMX_RGB, PROTOCOL_DMX_RGBW, PROTOCOL_DMX_WHITE})
 
-    current_id = 0
+# Channels per light (single channel when not listed). DALI channels sit on
+# consecutive addresses, DMX channels on consecutive slots.
+_PROTOCOL_CHANNEL_COUNT = {
+    PROTOCOL_DALI_RGB: 3,
+    PROTOCOL_DALI_RGBW: 4,
+    PROTOCOL_DMX_RGB: 3,
+    PROTOCOL_DMX_RGBW: 4,
+}
 
-    def increment_and_get_id():
-        nonlocal current_id
-        current_id += 1
-        return current_id
+# Keys every configured light needs before an entity is created for it
+_REQUIRED_LIGHT_KEYS = frozenset(
+    {CONF_LIGHT_ID, CONF_LIGHT_ADDRESS, CONF_LIGHT_NAME, CONF_LIGHT_PROTOCOL}
+)
 
-    return increment_and_get_id
+# The single color mode each protocol exposes (brightness only when not listed)
+_PROTO_COLOR_MODE = {
+    PROTOCOL_DALI_RGB: ColorMode.RGB,
+    PROTOCOL_DMX_RGB: ColorMode.RGB,
+    PROTOCOL_DALI_RGBW: ColorMode.RGBW,
+    PROTOCOL_DMX_RGBW: ColorMode.RGBW,
+    PROTOCOL_DALI_DT8_XY: ColorMode.RGBW,
+    PROTOCOL_DALI_DT8_CCT: ColorMode.COLOR_TEMP,
+}
 
 
-async def async_setup_entry(
-    hass: HomeAssistant,
-    entry: ConfigEntry,  # This 'entry' is already the config_entry object passed by HA
-    async_add_entities: AddEntitiesCallback,
-) -> None:
-    """Set up Control Freak lights from config entry."""
-    client_data = hass.data[DOMAIN][entry.entry_id]
-    client: EdidioClient = client_data["client"]  # Type hint for clarity
+def _scale_u8(channels, brightness: int) -> list[int]:
+    """Scale 8-bit channel levels by an HA brightness (0-255)."""
+    return [c * brightness // 255 for c in channels]
 
-    get_next_message_id = get_message_id_generator()
 
-    # Get the lights configuration directly from the entry.options
-    lights_config = entry.options.get(CONF_LIGHTS, [])
-    _LOGGER.debug(
-        "Light platform async_setup_entry: retrieved lights_config: %s", lights_config
-    )
+def _scale_dali(channels, brightness: int) -> list[int]:
+    """Scale 8-bit channel levels by an HA brightness to DALI arc levels."""
+    # Brightness and the HA to DALI range are applied in one integer step
+    scale = brightness * _DALI_MAX
+    return [_sat_dali(c * scale // _HA2_MAX) for c in channels]
+
+
+def _sat_dali(level: int) -> int:
+    """Saturate a non-negative level at the DALI maximum arc level."""
+    return min(level, _DALI_MAX)
+
 
-    entities_to_add = []
+def _valid_lights(lights_config: list[dict]) -> list[dict]:
+    """Return the light configurations that carry every required key."""
+    valid_lights = []
     for light_data in lights_config:
-        if CONF_LIGHT_ID not in light_data:
+        if missing := _REQUIRED_LIGHT_KEYS.difference(light_data):
             _LOGGER.error(
-                "Light data missing unique ID (%s). Skipping entity creation for: %s",
-                CONF_LIGHT_ID,
-                light_data,
-            )
-            continue
-        if CONF_LIGHT_ADDRESS not in light_data:
-            _LOGGER.error(
-                "Light data missing address (%s). Skipping entity creation for: %s",
-                CONF_LIGHT_ADDRESS,
-                light_data,
-            )
-            continue
-        if CONF_LIGHT_NAME not in light_data:
-            _LOGGER.error(
-                "Light data missing name (%s). Skipping entity creation for: %s",
-                CONF_LIGHT_NAME,
-                light_data,
-            )
-            continue
-        if CONF_LIGHT_PROTOCOL not in light_data:
-            _LOGGER.error(
-                "Light data missing protocol (%s). Skipping entity creation for: %s",
-                CONF_LIGHT_PROTOCOL,
+                "Light data missing %s. Skipping entity creation for: %s",
+                ", ".join(sorted(missing)),
                 light_data,
             )
             continue
+        valid_lights.append(light_data)
+    return valid_lights
 
-        entities_to_add.append(
-            ControlFreakLight(
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: EdidioConfigEntry,  # This 'entry' is already the config_entry object passed by HA
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up Control Freak lights from config entry."""
+    client = entry.runtime_data.client
+
+    # Incrementing message IDs shared by every light on this controller
+    get_next_message_id = count(1).__next__
+
+    # Entities currently added, and the configuration each was built from
+    entities: dict[str, ControlFreakLight] = {}
+    entity_configs: dict[str, dict] = {}
+
+    def _create_entities(lights_config: list[dict]) -> list[ControlFreakLight]:
+        """Create entities for lights that have not been added yet."""
+        new_entities = []
+        for light_data in lights_config:
+            light_id = light_data[CONF_LIGHT_ID]
+            if light_id in entities:
+                continue
+            entity = ControlFreakLight(
                 client,
                 light_data[CONF_LIGHT_ADDRESS],
                 light_data[CONF_LIGHT_NAME],
                 light_data[CONF_LIGHT_PROTOCOL],
                 get_next_message_id,
                 line=light_data.get(CONF_LIGHT_LINE, 1),  # Default to 1 if not present
-                stable_id=light_data.get(CONF_LIGHT_ID),  # Pass the stable ID
+                stable_id=light_id,  # Pass the stable ID
             )
-        )
+            entities[light_id] = entity
+            entity_configs[light_id] = dict(light_data)
+            new_entities.append(entity)
+        return new_entities
 
+    # Get the lights configuration directly from the entry.options
+    lights_config = entry.options.get(CONF_LIGHTS, [])
+    _LOGGER.debug(
+        "Light platform async_setup_entry: retrieved lights_config: %s", lights_config
+    )
+
+    entities_to_add = _create_entities(_valid_lights(lights_config))
     if entities_to_add:
         async_add_entities(entities_to_add)
         _LOGGER.debug("Added %d Control Freak light entities", len(entities_to_add))
     else:
         _LOGGER.debug("No Control Freak light entities to add")
 
+    async def _async_lights_updated() -> None:
+        """Reconcile light entities with the updated options, keeping the client."""
+        wanted = {
+            light_data[CONF_LIGHT_ID]: light_data
+            for light_data in _valid_lights(entry.options.get(CONF_LIGHTS, []))
+        }
+        entity_registry = er.async_get(hass)
+
+        for light_id in list(entities):
+            light_data = wanted.get(light_id)
+            if light_data == entity_configs[light_id]:
+                continue
+            if light_data is not None:
+                # Edited lights are updated in place, keeping the entity
+                entities[light_id].apply_config(light_data)
+                entity_configs[light_id] = dict(light_data)
+                continue
+            entity = entities.pop(light_id)
+            del entity_configs[light_id]
+            entity_id = entity.entity_id
+            await entity.async_remove(force_remove=True)
+            if entity_registry.async_get(entity_id):
+                entity_registry.async_remove(entity_id)
+            _LOGGER.debug("Removed Control Freak light entity %s", entity_id)
+
+        if new_entities := _create_entities(list(wanted.values())):
+            async_add_entities(new_entities)
+            _LOGGER.debug(
+                "Added %d Control Freak light entities after options update",
+                len(new_entities),
+            )
+
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, f"{SIGNAL_LIGHTS_UPDATED}_{entry.entry_id}", _async_lights_updated
+        )
+    )
+
+    @callback
+    def _async_connection_state(connected: bool) -> None:
+        """Follow the controller connection state on every light."""
+        for entity in entities.values():
+            entity.set_available(connected)
+
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass,
+            f"{SIGNAL_CONNECTION_STATE}_{entry.entry_id}",
+            _async_connection_state,
+        )
+    )
+
 
 class ControlFreakLight(LightEntity):
     """Light Object for the Contrl Freak Controller."""
 
+    _attr_should_poll = False
+
+    # _attr_* fields are left out, HA's CachedProperties metaclass manages them
+    __slots__ = (
+        "_address",
+        "_brightness",
+        "_build_cmds",
+        "_build_off",
+        "_cached_kelvin",
+        "_cct_a",
+        "_cct_b",
+        "_client",
+        "_color_temp",
+        "_get_message_id",
+        "_is_on",
+        "_line",
+        "_name",
+        "_off_dmx_message",
+        "_protocol",
+        "_rgb_color",
+        "_rgbw_color",
+        "_stable_id_value",
+    )
+
     def __init__(
         self,
         client: EdidioClient,
@@ -146,6 +257,7 @@ class ControlFreakLight(LightEntity):
         self._client = client
         self._address = address
         self._name = name
+        self._attr_name = name
         self._protocol = protocol
         self._line = line
         self._get_message_id = get_message_id_func
@@ -158,7 +270,7 @@ class ControlFreakLight(LightEntity):
                 "Light '%s' initialized with stable ID: %s", name, self._attr_unique_id
             )
         else:
-            new_uuid = str(uuid.uuid4())
+            new_uuid = uuid.uuid4().hex
             self._attr_unique_id = f"{DOMAIN}_{new_uuid}"
             self._stable_id_value = new_uuid
             _LOGGER.warning(
@@ -175,56 +287,65 @@ class ControlFreakLight(LightEntity):
         self._rgbw_color = (255, 255, 255, 255)  # Internal state for RGBW (R, G, B, W)
         self._color_temp = 3000
 
+        # Availability follows the controller connection, pushed by the
+        # integration rather than polled
+        self._attr_available = client.connected
+
+        self._bind_protocol()
+
+    def _bind_protocol(self) -> None:
+        """Bind the command builders and color settings for the current protocol."""
+        handler = _HANDLERS.get(self._protocol)
+        if handler is None:
+            _LOGGER.warning(
+                "Unsupported protocol '%s' for light %s. Falling back to DALI brightness commands",
+                self._protocol,
+                self._name,
+            )
+            handler = ControlFreakLight._build_fallback
+        self._build_cmds = handler.__get__(self)
+
+        self._attr_color_mode = _PROTO_COLOR_MODE.get(
+            self._protocol, ColorMode.BRIGHTNESS
+        )
+        self._attr_supported_color_modes = frozenset({self._attr_color_mode})
+
         # Set min/max color temp based on protocol
         if self._protocol == PROTOCOL_DALI_DT8_CCT:
             self._attr_min_color_temp_kelvin = 2000
             self._attr_max_color_temp_kelvin = 6500
+            # 6500K -> approx 153 mireds, 2000K -> approx 500 mireds
+            self._attr_min_mireds = color_temperature_kelvin_to_mired(6500)
+            self._attr_max_mireds = color_temperature_kelvin_to_mired(2000)
+            # Mireds to DALI DT8 value as one affine map, equivalent to
+            # (1 - (mired - max) / (min - max)) * 65535
+            span = self._attr_min_mireds - self._attr_max_mireds
+            self._cct_a = -65535.0 / span
+            # Anchored so the warm end (max mireds) lands exactly on 65535
+            self._cct_b = 65535.0 - self._cct_a * self._attr_max_mireds
         else:
             self._attr_min_color_temp_kelvin = None
             self._attr_max_color_temp_kelvin = None
-
-        # Default availability until update confirms connection
-        self._attr_available = True
-
-    @property
-    def unique_id(self):
-        """Return the unique ID for this light."""
-        return self._attr_unique_id
-
-    @property
-    def supported_color_modes(self) -> set[ColorMode]:
-        """Return the supported color modes based on protocol."""
-        if self._protocol in [PROTOCOL_DALI_RGB, PROTOCOL_DMX_RGB]:
-            return {ColorMode.RGB}
-        if self._protocol in [
-            PROTOCOL_DALI_RGBW,
-            PROTOCOL_DMX_RGBW,
-            PROTOCOL_DALI_DT8_XY,
-        ]:
-            return {ColorMode.RGBW}
-        if self._protocol == PROTOCOL_DALI_DT8_CCT:
-            return {ColorMode.COLOR_TEMP}
-        return {ColorMode.BRIGHTNESS}
-
-    @property
-    def color_mode(self) -> ColorMode:
-        """Return the current color mode of the light."""
-        if self._protocol in [PROTOCOL_DALI_RGB, PROTOCOL_DMX_RGB]:
-            return ColorMode.RGB
-        if self._protocol in [
-            PROTOCOL_DALI_RGBW,
-            PROTOCOL_DMX_RGBW,
-            PROTOCOL_DALI_DT8_XY,
-        ]:
-            return ColorMode.RGBW
-        if self._protocol == PROTOCOL_DALI_DT8_CCT:
-            return ColorMode.COLOR_TEMP
-        return ColorMode.BRIGHTNESS
-
-    @property
-    def name(self):
-        """Return the name of the light."""
-        return self._name
+            self._attr_min_mireds = None
+            self._attr_max_mireds = None
+            self._cct_a = None
+            self._cct_b = None
+
+        self._refresh_cached_kelvin()
+        self._bind_off_builders()
+
+    def _refresh_cached_kelvin(self, kelvin: int | None = None) -> None:
+        """Refresh the Kelvin reported to HA, whenever _color_temp changes.
+
+        A Kelvin value HA asked for is kept as is, rather than converted back
+        from the mireds derived from it.
+        """
+        if self._cct_a is None or self._color_temp is None:
+            self._cached_kelvin = None
+        elif kelvin is not None:
+            self._cached_kelvin = kelvin
+        else:
+            self._cached_kelvin = 1000000 // self._color_temp
 
     @property
     def is_on(self):
@@ -244,45 +365,321 @@ class ControlFreakLight(LightEntity):
     @property
     def rgbw_color(self):
         """Return the RGBW color of the light."""
-        if self._protocol in [
-            PROTOCOL_DALI_RGBW,
-            PROTOCOL_DMX_RGBW,
-            PROTOCOL_DALI_DT8_XY,
-        ]:
+        if self._attr_color_mode is ColorMode.RGBW:
             return self._rgbw_color
         return None
 
     @property
     def color_temp_kelvin(self):
         """Return the color temperature of the light in Kelvin."""
-        if self._protocol == PROTOCOL_DALI_DT8_CCT and self._color_temp is not None:
-            return color_temperature_mired_to_kelvin(self._color_temp)
-        return None
-
-    @property
-    def min_mireds(self):
-        """Return the minimum color temperature that this light supports."""
-        if self._protocol == PROTOCOL_DALI_DT8_CCT:
-            # These values should match _attr_min/max_color_temp_kelvin conversion
-            # 6500K -> approx 153 mireds
-            # 2000K -> approx 500 mireds
-            return color_temperature_kelvin_to_mired(self._attr_max_color_temp_kelvin)
-        return None
-
-    @property
-    def max_mireds(self):
-        """Return the maximum color temperature that this light supports."""
-        if self._protocol == PROTOCOL_DALI_DT8_CCT:
-            return color_temperature_kelvin_to_mired(self._attr_min_color_temp_kelvin)
-        return None
+        return self._cached_kelvin
 
     @property
     def available(self):
         """Return True if the device is connected and available."""
         return self._attr_available
 
+    def _dali_arc_commands(self, levels) -> list[bytes]:
+        """Build one ARC_LEVEL command per level, on consecutive DALI addresses."""
+        get_message_id = self._get_message_id
+        create_dali_message = self._client.create_dali_message
+        line = self._line
+        address = self._address
+        arc_level = pb.CustomDALICommandType.DALI_ARC_LEVEL
+        # A new list every call: an earlier send of this light's commands may
+        # still be iterating over the previous one between its paced writes
+        return [
+            create_dali_message(
+                message_id=get_message_id(),
+                line_mask=line,
+                address=address + i,
+                custom_command=arc_level,
+                arg=level,
+            )
+            for i, level in enumerate(levels)
+        ]
+
+    def _build_dmx_rgb(self) -> list[bytes]:
+        """Build the turn on commands for a DMX RGB light."""
+        brightness = self._brightness
+        level = _scale_u8(self._rgb_color[:3], brightness)
+
+        commands_to_send = [
+            self._client.create_dmx_message(
+                message_id=self._get_message_id(),
+                zone=0,
+                universe_mask=0b0010,
+                channel=self._address,
+                repeat=1,
+                level=level,
+                fade_time_by_10ms=25,
+            )
+        ]
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(
+                "Generated DMX_RGB color command(s) for %s (RGB: %s, Brightness: %s)",
+                self._name,
+                self._rgb_color,
+                brightness,
+            )
+        return commands_to_send
+
+    def _build_dmx_rgbw(self) -> list[bytes]:
+        """Build the turn on commands for a DMX RGBW light."""
+        brightness = self._brightness
+        level = _scale_u8(self._rgbw_color[:4], brightness)
+
+        commands_to_send = [
+            self._client.create_dmx_message(
+                message_id=self._get_message_id(),
+                zone=0,
+                universe_mask=0b0010,
+                channel=self._address,
+                repeat=1,
+                level=level,
+                fade_time_by_10ms=25,
+            )
+        ]
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(
+                "Generated DMX_RGBW color command(s) for %s (RGBW: %s, Brightness: %s)",
+                self._name,
+                self._rgbw_color,
+                brightness,
+            )
+        return commands_to_send
+
+    def _build_dali_rgb(self) -> list[bytes]:
+        """Build the turn on commands for a DALI RGB light."""
+        brightness = self._brightness
+        rgb_color = self._rgb_color
+        commands_to_send = self._dali_arc_commands(
+            _scale_dali(rgb_color[:3], brightness)
+        )
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(
+                "Generated DALI_RGB commands for %s (RGB: %s, Brightness: %s)",
+                self._name,
+                rgb_color,
+                brightness,
+            )
+        return commands_to_send
+
+    def _build_dali_rgbw(self) -> list[bytes]:
+        """Build the turn on commands for a DALI RGBW light."""
+        brightness = self._brightness
+
+        # Ensure the channels are (R, G, B, W)
+        channels = (
+            self._rgbw_color
+            if len(self._rgbw_color) == 4
+            else (
+                *self._rgb_color[:3],
+                255,  # Default white to full if only RGB is provided
+            )
+        )
+
+        # Brightness is applied to the white channel too
+        commands_to_send = self._dali_arc_commands(_scale_dali(channels, brightness))
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(
+                "Generated DALI_RGBW commands for %s (RGBW: %s, Brightness: %s)",
+                self._name,
+                self._rgbw_color,
+                brightness,
+            )
+        return commands_to_send
+
+    def _build_dali_dt8_xy(self) -> list[bytes]:
+        """Build the turn on commands for a DALI DT8 XY light."""
+        get_message_id = self._get_message_id
+        create_dali_message = self._client.create_dali_message
+        line = self._line
+        address = self._address
+
+        # Ensure self._rgbw_color is (R, G, B, W)
+        r, g, b, _ = (
+            self._rgbw_color
+            if len(self._rgbw_color) == 4
+            else (
+                *self._rgb_color,
+                255,
+            )  # Default white to full if only RGB is provided
+        )
+
+        x16, y16 = rgb_to_xy_16bit(r, g, b)
+
+        # Always four commands, sent in this order
+        commands_to_send = [
+            create_dali_message(
+                message_id=get_message_id(),
+                line_mask=line,
+                address=address,
+                type8=pb.Type8CommandType.SET_TEMP_X_COORD,
+                dtr=x16.to_bytes(2, "little"),  # LSB, MSB
+            ),
+            create_dali_message(
+                message_id=get_message_id(),
+                line_mask=line,
+                address=address,
+                type8=pb.Type8CommandType.SET_TEMP_Y_COORD,
+                dtr=y16.to_bytes(2, "little"),
+            ),
+            create_dali_message(
+                message_id=get_message_id(),
+                line_mask=line,
+                address=address,
+                custom_command=pb.CustomDALICommandType.DALI_ARC_LEVEL,
+                arg=_ARC_LUT[self._brightness],
+            ),
+            create_dali_message(
+                message_id=get_message_id(),
+                line_mask=line,
+                address=address,
+                type8=pb.Type8CommandType.ACTIVATE,
+            ),
+        ]
+
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(
+                "Generated DALI DT8 XY commands for %s (RGB: %s, Brightness: %s). XY: (%s, %s)",
+                self._name,
+                (r, g, b),
+                self._brightness,
+                x16,
+                y16,
+            )
+        return commands_to_send
+
+    def _build_dali_dt8_cct(self) -> list[bytes]:
+        """Build the turn on commands for a DALI DT8 CCT light."""
+        if self._color_temp is None:
+            return []
+
+        get_message_id = self._get_message_id
+        create_dali_message = self._client.create_dali_message
+        line = self._line
+        address = self._address
+
+        # Convert HA mireds to DALI DT8 Color Temperature (0-65535)
+        # Note: DALI DT8 Color Temperature is not directly Mireds or Kelvin.
+        # It's a scaled value from Min to Max Colour Temperature.
+        # DALI DT8 range is 0 (warmest, max mireds) to 65535 (coolest, min mireds).
+
+        # HA mireds: min_mireds (coolest) to max_mireds (warmest)
+        # DALI DT8: 0 (warmest) to 65535 (coolest)
+
+        # Map HA mireds (e.g., 153-500) to DALI DT8 range (0-65535)
+        # min_mireds -> 65535 (coolest)
+        # max_mireds -> 0 (warmest)
+
+        # Normalize, invert and scale in one affine step (see _bind_protocol);
+        # the outer min/max acts as a safety clamp
+        dali_dt8_cct_value = max(
+            0, min(65535, int(self._cct_a * self._color_temp + self._cct_b))
+        )
+
+        # Colour temperature, then brightness, then DT8 Activate
+        commands_to_send = [
+            create_dali_message(
+                message_id=get_message_id(),
+                line_mask=line,
+                address=address,
+                type8=pb.Type8CommandType.SET_TEMP_COLOUR_TEMPERATURE,
+                dtr=dali_dt8_cct_value.to_bytes(2, "little"),  # LSB, MSB
+            ),
+            create_dali_message(
+                message_id=get_message_id(),
+                line_mask=line,
+                address=address,
+                custom_command=pb.CustomDALICommandType.DALI_ARC_LEVEL,
+                arg=_ARC_LUT[self._brightness],
+            ),
+            create_dali_message(
+                message_id=get_message_id(),
+                line_mask=line,
+                address=address,
+                type8=pb.Type8CommandType.ACTIVATE,
+            ),
+        ]
+
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(
+                "Generated DALI DT8 CCT commands for %s (HA Mireds: %s, DALI DT8 CCT: %s, Brightness: %s)",
+                self._name,
+                self._color_temp,
+                dali_dt8_cct_value,
+                self._brightness,
+            )
+        return commands_to_send
+
+    def _build_dali_white(self) -> list[bytes]:
+        """Build the turn on commands for a DALI White light."""
+        dali_arc_level = _ARC_LUT[self._brightness]
+        commands_to_send = [
+            self._client.create_dali_message(
+                message_id=self._get_message_id(),
+                line_mask=self._line,
+                address=self._address,
+                custom_command=pb.CustomDALICommandType.DALI_ARC_LEVEL,
+                arg=dali_arc_level,
+            )
+        ]
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(
+                "Generated DALI_WHITE brightness command for %s (Brightness: %s)",
+                self._name,
+                self._brightness,
+            )
+        return commands_to_send
+
+    def _build_dmx_white(self) -> list[bytes]:
+        """Build the turn on commands for a DMX White light."""
+        commands_to_send = [
+            self._client.create_dmx_message(
+                message_id=self._get_message_id(),
+                zone=0,
+                universe_mask=0b0010,
+                channel=self._address,
+                repeat=1,
+                level=[self._brightness],
+                fade_time_by_10ms=25,  # Set Nice Fade Time
+            )
+        ]
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(
+                "Generated DMX_WHITE brightness command for %s (Brightness: %s)",
+                self._name,
+                self._brightness,
+            )
+        return commands_to_send
+
+    def _build_fallback(self) -> list[bytes]:
+        """Build a DALI brightness command for an unsupported protocol."""
+        # Default to DALI white if it's the most common fallback, otherwise handle DMX/etc.
+        # For now, replicate the DALI_WHITE logic for fallback:
+        dali_arc_level = _ARC_LUT[self._brightness]
+        commands_to_send = [
+            self._client.create_dali_message(
+                message_id=self._get_message_id(),  # Use the incrementing function
+                line_mask=self._line,
+                address=self._address,
+                custom_command=pb.CustomDALICommandType.DALI_ARC_LEVEL,
+                arg=dali_arc_level,
+            )
+        ]
+        return commands_to_send
+
     async def async_turn_on(self, **kwargs):
         """Turn the light on with brightness and color control."""
+        prev = (
+            self._is_on,
+            self._brightness,
+            self._rgb_color,
+            self._rgbw_color,
+            self._color_temp,
+        )
+
         # 1. Update internal state based on kwargs
         if "brightness" in kwargs:
             self._brightness = kwargs["brightness"]
@@ -291,381 +688,32 @@ class ControlFreakLight(LightEntity):
 
         if "rgb_color" in kwargs:
             self._rgb_color = kwargs["rgb_color"]
+        # RGBW lights report and build from _rgbw_color only, so the RGB part
+        # is not mirrored into _rgb_color
         if "rgbw_color" in kwargs:
             self._rgbw_color = kwargs["rgbw_color"]
-            self._rgb_color = self._rgbw_color[:3]  # Keep RGB part updated
 
         if "color_temp_kelvin" in kwargs:
-            self._color_temp = color_temperature_kelvin_to_mired(
-                kwargs["color_temp_kelvin"]
-            )
-
-        commands_to_send = []  # This list will hold raw protobuf messages
+            kelvin = kwargs["color_temp_kelvin"]
+            self._color_temp = color_temperature_kelvin_to_mired(kelvin)
+            self._refresh_cached_kelvin(kelvin)
+
+        # Already on with exactly this state, nothing to send to the device
+        if prev == (
+            True,
+            self._brightness,
+            self._rgb_color,
+            self._rgbw_color,
+            self._color_temp,
+        ):
+            self.async_write_ha_state()
+            return
 
-        # 2. Generate commands based on protocol and updated internal state
+        # 2. Generate commands with the builder bound for this protocol
         try:
-            if self._protocol == PROTOCOL_DMX_RGB:
-                r, g, b = self._rgb_color[:3]
-                scaling_factor = self._brightness / 255.0
-                scaled_r = int(r * scaling_factor)
-                scaled_g = int(g * scaling_factor)
-                scaled_b = int(b * scaling_factor)
-
-                commands_to_send.append(
-                    self._client.create_dmx_message(
-                        message_id=self._get_message_id(),
-                        zone=0,
-                        universe_mask=0b0010,
-                        channel=self._address,
-                        repeat=1,
-                        level=[scaled_r, scaled_g, scaled_b],
-                        fade_time_by_10ms=25,
-                    )
-                )
-                _LOGGER.debug(
-                    "Generated DMX_RGB color command(s) for %s (RGB: %s, Brightness: %s). Total commands: %s",
-                    self._name,
-                    self._rgb_color,
-                    self._brightness,
-                    len(commands_to_send),
-                )
-
-            elif self._protocol == PROTOCOL_DMX_RGBW:
-                r, g, b, w = self._rgbw_color[:4]
-                scaling_factor = self._brightness / 255.0
-                scaled_r = int(r * scaling_factor)
-                scaled_g = int(g * scaling_factor)
-                scaled_b = int(b * scaling_factor)
-                scaled_w = int(w * scaling_factor)
-
-                commands_to_send.append(
-                    self._client.create_dmx_message(
-                        message_id=self._get_message_id(),
-                        zone=0,
-                        universe_mask=0b0010,
-                        channel=self._address,
-                        repeat=1,
-                        level=[scaled_r, scaled_g, scaled_b, scaled_w],
-                        fade_time_by_10ms=25,
-                    )
-                )
-                _LOGGER.debug(
-                    "Generated DMX_RGBW color command(s) for %s (RGBW: %s, Brightness: %s). Total commands: %s",
-                    self._name,
-                    self._rgbw_color,
-                    self._brightness,
-                    len(commands_to_send),
-                )
-
-            elif self._protocol == PROTOCOL_DALI_RGB:
-                dali_max_val = DALI_ARC_LEVEL_MAX
-                ha_max = 255.0
-
-                effective_r = int(self._rgb_color[0] * (self._brightness / ha_max))
-                effective_g = int(self._rgb_color[1] * (self._brightness / ha_max))
-                effective_b = int(self._rgb_color[2] * (self._brightness / ha_max))
-
-                dali_r = min(int(effective_r * (dali_max_val / ha_max)), dali_max_val)
-                dali_g = min(int(effective_g * (dali_max_val / ha_max)), dali_max_val)
-                dali_b = min(int(effective_b * (dali_max_val / ha_max)), dali_max_val)
-
-                commands_to_send.append(
-                    self._client.create_dali_message(
-                        message_id=self._get_message_id(),
-                        line_mask=self._line,
-                        address=self._address,
-                        custom_command=pb.CustomDALICommandType.DALI_ARC_LEVEL,
-                        arg=[dali_r],
-                    )
-                )
-                commands_to_send.append(
-                    self._client.create_dali_message(
-                        message_id=self._get_message_id(),
-                        line_mask=self._line,
-                        address=self._address + 1,
-                        custom_command=pb.CustomDALICommandType.DALI_ARC_LEVEL,
-                        arg=[dali_g],
-                    )
-                )
-                commands_to_send.append(
-                    self._client.create_dali_message(
-                        message_id=self._get_message_id(),
-                        line_mask=self._line,
-                        address=self._address + 2,
-                        custom_command=pb.CustomDALICommandType.DALI_ARC_LEVEL,
-                        arg=[dali_b],
-                    )
-                )
-                _LOGGER.debug(
-                    "Generated DALI_RGB commands for %s (RGB: %s, Brightness: %s). Total commands: %s",
-                    self._name,
-                    self._rgb_color,
-                    self._brightness,
-                    len(commands_to_send),
-                )
-
-            elif self._protocol == PROTOCOL_DALI_RGBW:
-                # Ensure self._rgbw_color is (R, G, B, W)
-                r, g, b, w = (
-                    self._rgbw_color
-                    if len(self._rgbw_color) == 4
-                    else (
-                        self._rgb_color[0],
-                        self._rgb_color[1],
-                        self._rgb_color[2],
-                        255,  # Default white to full if only RGB is provided
-                    )
-                )
-
-                dali_max_val = DALI_ARC_LEVEL_MAX
-                ha_max = 255.0
-
-                effective_r = int(r * (self._brightness / ha_max))
-                effective_g = int(g * (self._brightness / ha_max))
-                effective_b = int(b * (self._brightness / ha_max))
-                effective_w = int(
-                    w * (self._brightness / ha_max)
-                )  # Apply brightness to white channel
-
-                dali_r = min(int(effective_r * (dali_max_val / ha_max)), dali_max_val)
-                dali_g = min(int(effective_g * (dali_max_val / ha_max)), dali_max_val)
-                dali_b = min(int(effective_b * (dali_max_val / ha_max)), dali_max_val)
-                dali_w = min(int(effective_w * (dali_max_val / ha_max)), dali_max_val)
-
-                commands_to_send.append(
-                    self._client.create_dali_message(
-                        message_id=self._get_message_id(),
-                        line_mask=self._line,
-                        address=self._address,
-                        custom_command=pb.CustomDALICommandType.DALI_ARC_LEVEL,
-                        arg=[dali_r],
-                    )
-                )
-                commands_to_send.append(
-                    self._client.create_dali_message(
-                        message_id=self._get_message_id(),
-                        line_mask=self._line,
-                        address=self._address + 1,
-                        custom_command=pb.CustomDALICommandType.DALI_ARC_LEVEL,
-                        arg=[dali_g],
-                    )
-                )
-                commands_to_send.append(
-                    self._client.create_dali_message(
-                        message_id=self._get_message_id(),
-                        line_mask=self._line,
-                        address=self._address + 2,
-                        custom_command=pb.CustomDALICommandType.DALI_ARC_LEVEL,
-                        arg=[dali_b],
-                    )
-                )
-                commands_to_send.append(
-                    self._client.create_dali_message(
-                        message_id=self._get_message_id(),
-                        line_mask=self._line,
-                        address=self._address + 3,
-                        custom_command=pb.CustomDALICommandType.DALI_ARC_LEVEL,
-                        arg=[dali_w],
-                    )
-                )
-                _LOGGER.debug(
-                    "Generated DALI_RGBW commands for %s (RGBW: %s, Brightness: %s). Total commands: %s",
-                    self._name,
-                    self._rgbw_color,
-                    self._brightness,
-                    len(commands_to_send),
-                )
-
-            elif self._protocol == PROTOCOL_DALI_DT8_XY:
-                # Ensure self._rgbw_color is (R, G, B, W)
-                r, g, b, w = (
-                    self._rgbw_color
-                    if len(self._rgbw_color) == 4
-                    else (
-                        *self._rgb_color,
-                        255,
-                    )  # Default white to full if only RGB is provided
-                )
-
-                x16, y16 = rgb_to_xy_16bit(r, g, b)
-
-                # Break 16-bit values into LSB/MSB
-                x_lsb, x_msb = x16 & 0xFF, (x16 >> 8) & 0xFF
-                y_lsb, y_msb = y16 & 0xFF, (y16 >> 8) & 0xFF
-
-                commands_to_send.append(
-                    self._client.create_dali_message(
-                        message_id=self._get_message_id(),
-                        line_mask=self._line,
-                        address=self._address,
-                        type8=pb.Type8CommandType.SET_TEMP_X_COORD,
-                        dtr=[x_lsb, x_msb],
-                    )
-                )
-
-                commands_to_send.append(
-                    self._client.create_dali_message(
-                        message_id=self._get_message_id(),
-                        line_mask=self._line,
-                        address=self._address,
-                        type8=pb.Type8CommandType.SET_TEMP_Y_COORD,
-                        dtr=[y_lsb, y_msb],
-                    )
-                )
-
-                commands_to_send.append(
-                    self._client.create_dali_message(
-                        message_id=self._get_message_id(),
-                        line_mask=self._line,
-                        address=self._address,
-                        custom_command=pb.CustomDALICommandType.DALI_ARC_LEVEL,
-                        arg=[int(self._brightness / 255.0 * DALI_ARC_LEVEL_MAX)],
-                    )
-                )
-
-                commands_to_send.append(
-                    self._client.create_dali_message(
-                        message_id=self._get_message_id(),
-                        line_mask=self._line,
-                        address=self._address,
-                        type8=pb.Type8CommandType.ACTIVATE,
-                    )
-                )
+            commands_to_send = self._build_cmds()
 
-                _LOGGER.debug(
-                    "Generated DALI DT8 XY commands for %s (RGB: %s, Brightness: %s). XY: (%s, %s)",
-                    self._name,
-                    (r, g, b),
-                    self._brightness,
-                    x16,
-                    y16,
-                )
-            elif self._protocol == PROTOCOL_DALI_DT8_CCT:
-                if self._color_temp is not None:
-                    # Convert HA mireds to DALI DT8 Color Temperature (0-65535)
-                    # Note: DALI DT8 Color Temperature is not directly Mireds or Kelvin.
-                    # It's a scaled value from Min to Max Colour Temperature.
-                    # DALI DT8 range is 0 (warmest, max mireds) to 65535 (coolest, min mireds).
-
-                    # HA mireds: min_mireds (coolest) to max_mireds (warmest)
-                    # DALI DT8: 0 (warmest) to 65535 (coolest)
-
-                    # Map HA mireds (e.g., 153-500) to DALI DT8 range (0-65535)
-                    # min_mireds -> 65535 (coolest)
-                    # max_mireds -> 0 (warmest)
-
-                    # Normalize HA mireds to 0-1 (0 is warmest, 1 is coolest)
-                    normalized_mired = (self._color_temp - self.max_mireds) / (
-                        self.min_mireds - self.max_mireds
-                    )
-
-                    # Invert and scale to DALI DT8 range (0 warmest, 65535 coolest)
-                    dali_dt8_cct_value = int((1 - normalized_mired) * 65535)
-
-                    # This acts as a safety clamp
-                    dali_dt8_cct_value = max(0, min(65535, dali_dt8_cct_value))
-
-                    # Split the 16-bit value into Least Significant Byte (LSB) and Most Significant Byte (MSB).
-                    dali_cct_lsb = dali_dt8_cct_value & 0xFF
-                    dali_cct_msb = (dali_dt8_cct_value >> 8) & 0xFF
-
-                    commands_to_send.append(
-                        self._client.create_dali_message(
-                            message_id=self._get_message_id(),
-                            line_mask=self._line,
-                            address=self._address,
-                            type8=pb.Type8CommandType.SET_TEMP_COLOUR_TEMPERATURE,
-                            dtr=[dali_cct_lsb, dali_cct_msb],
-                        )
-                    )
-
-                    # Also send brightness for CCT
-                    commands_to_send.append(
-                        self._client.create_dali_message(
-                            message_id=self._get_message_id(),
-                            line_mask=self._line,
-                            address=self._address,
-                            custom_command=pb.CustomDALICommandType.DALI_ARC_LEVEL,
-                            arg=[int(self._brightness / 255.0 * DALI_ARC_LEVEL_MAX)],
-                        )
-                    )
-
-                    # Send DT8 Activate
-                    commands_to_send.append(
-                        self._client.create_dali_message(
-                            message_id=self._get_message_id(),
-                            line_mask=self._line,
-                            address=self._address,
-                            type8=pb.Type8CommandType.ACTIVATE,
-                        )
-                    )
-
-                    _LOGGER.debug(
-                        "Generated DALI DT8 CCT commands for %s (HA Mireds: %s, DALI DT8 CCT: %s, Brightness: %s). Total commands: %s",
-                        self._name,
-                        self._color_temp,
-                        dali_dt8_cct_value,
-                        self._brightness,
-                        len(commands_to_send),
-                    )
-
-            elif self._protocol == PROTOCOL_DALI_WHITE:
-                dali_arc_level = int(self._brightness / 255.0 * DALI_ARC_LEVEL_MAX)
-                commands_to_send.append(
-                    self._client.create_dali_message(
-                        message_id=self._get_message_id(),
-                        line_mask=self._line,
-                        address=self._address,
-                        custom_command=pb.CustomDALICommandType.DALI_ARC_LEVEL,
-                        arg=[dali_arc_level],
-                    )
-                )
-                _LOGGER.debug(
-                    "Generated DALI_WHITE brightness command for %s (Brightness: %s). Total commands: %s",
-                    self._name,
-                    self._brightness,
-                    len(commands_to_send),
-                )
-
-            elif self._protocol == PROTOCOL_DMX_WHITE:
-                commands_to_send.append(
-                    self._client.create_dmx_message(
-                        message_id=self._get_message_id(),
-                        zone=0,
-                        universe_mask=0b0010,
-                        channel=self._address,
-                        repeat=1,
-                        level=[self._brightness],
-                        fade_time_by_10ms=25,  # Set Nice Fade Time
-                    )
-                )
-                _LOGGER.debug(
-                    "Generated DMX_WHITE brightness command for %s (Brightness: %s). Total commands: %s",
-                    self._name,
-                    self._brightness,
-                    len(commands_to_send),
-                )
-
-            else:
-                _LOGGER.warning(
-                    "Unsupported protocol '%s' for light %s. Sending brightness command as fallback",
-                    self._protocol,
-                    self._name,
-                )
-                # Default to DALI white if it's the most common fallback, otherwise handle DMX/etc.
-                # For now, replicate the DALI_WHITE logic for fallback:
-                dali_arc_level = int(self._brightness / 255.0 * DALI_ARC_LEVEL_MAX)
-                commands_to_send.append(
-                    self._client.create_dali_message(
-                        message_id=self._get_message_id(),  # Use the incrementing function
-                        line_mask=self._line,
-                        address=self._address,
-                        custom_command=pb.CustomDALICommandType.DALI_ARC_LEVEL,
-                        arg=[dali_arc_level],
-                    )
-                )
-
-            # 3. Send all generated commands sequentially using the client
+            # 3. Send all generated commands using the client
             if not commands_to_send:
                 _LOGGER.warning(
                     "No commands generated for light %s with protocol %s",
@@ -674,6 +722,7 @@ class ControlFreakLight(LightEntity):
                 )
                 return
 
+            # Sequenced so the client keeps its pacing between DALI frames
             await self._client.send_dali_commands_sequence(commands_to_send)
 
         except (
@@ -682,146 +731,44 @@ class ControlFreakLight(LightEntity):
             EDIDIOTimeoutError,
         ) as e:
             _LOGGER.error("Communication error turning on light %s: %s", self._name, e)
-            self._attr_available = False
+            self._async_turn_on_failed(prev)
             return
         except Exception:
             _LOGGER.exception(
                 "An unexpected error occurred while turning on light %s", self._name
             )
-            self._attr_available = False
+            self._async_turn_on_failed(prev)
             return
 
         # 4. Update internal entity state and notify Home Assistant
         self._is_on = True
         self.async_write_ha_state()
 
+    def _async_turn_on_failed(self, prev: tuple) -> None:
+        """Restore the state from before a failed turn on and mark the light unavailable."""
+        # The device never got the new values, so a retry must not be skipped
+        # as a no-op against them
+        (
+            self._is_on,
+            self._brightness,
+            self._rgb_color,
+            self._rgbw_color,
+            self._color_temp,
+        ) = prev
+        self._refresh_cached_kelvin()
+        self._async_set_unavailable()
+
+    def _async_set_unavailable(self) -> None:
+        """Mark the light unavailable and publish the state straight away."""
+        self._attr_available = False
+        # Already in the event loop, so write directly rather than going
+        # through schedule_update_ha_state and call_soon_threadsafe
+        self.async_write_ha_state()
+
     async def async_turn_off(self, **kwargs):
         """Turn the light off."""
-        commands_to_send = []
-
         try:
-            # For DMX, sending brightness 0 or all channels to 0
-            if self._protocol in [
-                PROTOCOL_DMX_RGB,
-                PROTOCOL_DMX_RGBW,
-                PROTOCOL_DMX_WHITE,
-            ]:
-                # Send 0 brightness to all channels for DMX
-                if self._protocol == PROTOCOL_DMX_RGB:
-                    commands_to_send.append(
-                        self._client.create_dmx_message(
-                            message_id=self._get_message_id(),
-                            zone=0,
-                            universe_mask=0b0010,
-                            channel=self._address,
-                            repeat=1,
-                            level=[0, 0, 0],
-                            fade_time_by_10ms=25,
-                        )
-                    )
-                elif self._protocol == PROTOCOL_DMX_RGBW:
-                    commands_to_send.append(
-                        self._client.create_dmx_message(
-                            message_id=self._get_message_id(),
-                            zone=0,
-                            universe_mask=0b0010,
-                            channel=self._address,
-                            repeat=1,
-                            level=[0, 0, 0, 0],
-                            fade_time_by_10ms=25,
-                        )
-                    )
-                elif self._protocol == PROTOCOL_DMX_WHITE:
-                    commands_to_send.append(
-                        self._client.create_dmx_message(
-                            message_id=self._get_message_id(),
-                            zone=0,
-                            universe_mask=0b0010,
-                            channel=self._address,
-                            repeat=1,
-                            level=[0],
-                            fade_time_by_10ms=25,
-                        )
-                    )
-                _LOGGER.debug(
-                    "Turning off %s (%s) by sending zero DMX levels",
-                    self._name,
-                    self._protocol,
-                )
-            # For DALI, sending ARC_LEVEL to 0 is common
-            elif self._protocol in [
-                PROTOCOL_DALI_DT8_XY,
-                PROTOCOL_DALI_DT8_CCT,
-                PROTOCOL_DALI_WHITE,
-            ]:
-                dali_arc_level = 0  # Zero brightness
-                commands_to_send.append(
-                    self._client.create_dali_message(
-                        message_id=self._get_message_id(),
-                        line_mask=self._line,
-                        address=self._address,
-                        custom_command=pb.CustomDALICommandType.DALI_ARC_LEVEL,
-                        arg=[dali_arc_level],
-                    )
-                )
-                _LOGGER.debug(
-                    "Turning off %s (%s) by sending DALI ARC_LEVEL 0",
-                    self._name,
-                    self._protocol,
-                )
-
-            elif self._protocol == PROTOCOL_DALI_RGB:
-                channel_count = 3  # RGB has 3 channels
-                commands_to_send.extend(
-                    [
-                        self._client.create_dali_message(
-                            message_id=self._get_message_id(),
-                            line_mask=self._line,
-                            address=self._address + i,
-                            custom_command=pb.CustomDALICommandType.DALI_ARC_LEVEL,
-                            arg=[0],
-                        )
-                        for i in range(channel_count)
-                    ]
-                )
-            elif self._protocol == PROTOCOL_DALI_RGBW:
-                channel_count = 4  # RGBW has 4 channels
-                commands_to_send.extend(
-                    [
-                        self._client.create_dali_message(
-                            message_id=self._get_message_id(),
-                            line_mask=self._line,
-                            address=self._address + i,
-                            custom_command=pb.CustomDALICommandType.DALI_ARC_LEVEL,
-                            arg=[0],
-                        )
-                        for i in range(channel_count)
-                    ]
-                )
-            else:
-                _LOGGER.warning(
-                    "Unsupported protocol '%s' for light %s. Defaulting to DALI ARC_LEVEL 0 for turn off",
-                    self._protocol,
-                    self._name,
-                )
-                commands_to_send.append(
-                    self._client.create_dali_message(
-                        message_id=self._get_message_id(),
-                        line_mask=self._line,
-                        address=self._address,
-                        custom_command=pb.CustomDALICommandType.DALI_ARC_LEVEL,
-                        arg=[0],
-                    )
-                )
-
-            if not commands_to_send:
-                _LOGGER.warning(
-                    "No commands generated for turning off light %s with protocol %s",
-                    self._name,
-                    self._protocol,
-                )
-                return
-
+            commands_to_send = self._build_off()
             await self._client.send_dali_commands_sequence(commands_to_send)
 
         except (
@@ -830,54 +777,167 @@ class ControlFreakLight(LightEntity):
             EDIDIOTimeoutError,
         ) as e:
             _LOGGER.error("Communication error turning off light %s: %s", self._name, e)
-            self._attr_available = False
+            self._async_set_unavailable()
             return
         except Exception:
             _LOGGER.exception(
                 "An unexpected error occurred while turning off light %s", self._name
             )
-            self._attr_available = False
+            self._async_set_unavailable()
             return
 
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(
+                "Turned off %s (%s) with %d zero level commands",
+                self._name,
+                self._protocol,
+                len(commands_to_send),
+            )
         self._is_on = False
         self._brightness = 0
         self.async_write_ha_state()
 
-    async def async_update(self):
-        """Fetch new state data for the light."""
-        try:
-            self._attr_available = self._client.connected
-
-            if self._attr_available:
-                pass
-
-        except (
-            EDIDIOConnectionError,
-            EDIDIOCommunicationError,
-            EDIDIOTimeoutError,
-        ) as e:
-            _LOGGER.debug(
-                "Client connection error during update for %s: %s", self._name, e
+    def _bind_off_builders(self) -> None:
+        """Bind the turn off command builder for the current protocol and address."""
+        # Send 0 brightness to every channel of the light
+        zero_levels = (0,) * _PROTOCOL_CHANNEL_COUNT.get(self._protocol, 1)
+        if self._protocol in _DMX_PROTOCOLS:
+            # Only the message ID changes between calls
+            self._off_dmx_message = partial(
+                self._client.create_dmx_message,
+                zone=0,
+                universe_mask=0b0010,
+                channel=self._address,
+                repeat=1,
+                level=zero_levels,
+                fade_time_by_10ms=25,
             )
-            self._attr_available = False
-        except Exception:
-            _LOGGER.exception(
-                "An unexpected error occurred during update for %s", self._name
-            )
-            self._attr_available = False
+            self._build_off = self._build_off_dmx
+        else:
+            # For DALI, one ARC_LEVEL 0 per channel address
+            self._off_dmx_message = None
+            self._build_off = partial(self._dali_arc_commands, zero_levels)
+
+    def _build_off_dmx(self) -> list[bytes]:
+        """Build the turn off command for a DMX light."""
+        return [self._off_dmx_message(message_id=self._get_message_id())]
 
     def set_protocol(self, protocol):
         """Dynamically set the protocol (DALI/DMX)."""
         self._protocol = protocol
+        self._bind_protocol()
 
     def set_address(self, address):
         """Dynamically set the address."""
         self._address = address
+        self._bind_off_builders()
+
+    def set_available(self, available: bool) -> None:
+        """Set availability from the controller connection state."""
+        if available == self._attr_available:
+            return
+        self._attr_available = available
+        if self.hass is not None:
+            self.async_write_ha_state()
+
+    def set_line(self, line):
+        """Dynamically set the DALI line."""
+        self._line = line
+
+    def set_name(self, name):
+        """Dynamically set the name."""
+        self._name = name
+        self._attr_name = name
+
+    def apply_config(self, light_data: dict) -> None:
+        """Apply an edited light configuration and write the new state."""
+        self.set_name(light_data[CONF_LIGHT_NAME])
+        self.set_line(light_data.get(CONF_LIGHT_LINE, 1))
+        self._address = light_data[CONF_LIGHT_ADDRESS]
+        # Rebinds the off builders for the new address too
+        self.set_protocol(light_data[CONF_LIGHT_PROTOCOL])
+        if self.hass is not None:
+            self.async_write_ha_state()
+
+
+# Turn on command builders, bound per light by ControlFreakLight._bind_protocol
+_HANDLERS = {
+    PROTOCOL_DMX_RGB: ControlFreakLight._build_dmx_rgb,
+    PROTOCOL_DMX_RGBW: ControlFreakLight._build_dmx_rgbw,
+    PROTOCOL_DALI_RGB: ControlFreakLight._build_dali_rgb,
+    PROTOCOL_DALI_RGBW: ControlFreakLight._build_dali_rgbw,
+    PROTOCOL_DALI_DT8_XY: ControlFreakLight._build_dali_dt8_xy,
+    PROTOCOL_DALI_DT8_CCT: ControlFreakLight._build_dali_dt8_cct,
+    PROTOCOL_DALI_WHITE: ControlFreakLight._build_dali_white,
+    PROTOCOL_DMX_WHITE: ControlFreakLight._build_dmx_white,
+}
+
+
+# Wide RGB D65 linear RGB to XYZ matrix, one row per X, Y and Z
+_RGB_TO_XYZ = (
+    (0.649926, 0.103455, 0.197109),
+    (0.234327, 0.743075, 0.022598),
+    (0.0, 0.053077, 1.035763),
+)
+
+
+# Reciprocals of the sRGB curve divisors, so _gamma only multiplies
+_GAMMA_SCALE = 1.0 / (1.0 + 0.055)
+_LINEAR_SCALE = 1.0 / 12.92
+
+
+def _gamma(c):
+    """Apply sRGB gamma correction to a 0-1 channel value."""
+    if c > 0.045045:
+        return ((c + 0.055) * _GAMMA_SCALE) ** 2.4
+    return c * _LINEAR_SCALE
+
+
+# Normalized and gamma corrected value of every 8-bit channel. Like the
+# float path, 0 and 1 are taken as already normalized.
+_GAMMA_LUT = tuple(_gamma(c / 255.0 if c > 1 else c) for c in range(256))
+
+
+def _linear_rgb_to_xy_16bit(r, g, b) -> tuple[int, int]:
+    """Convert gamma corrected 0-1 RGB to 16-bit XY using Wide RGB D65."""
+    # Step 3: Convert to XYZ using Wide RGB D65
+    (xr, xg, xb), (yr, yg, yb), (zr, zg, zb) = _RGB_TO_XYZ
+    X = r * xr + g * xg + b * xb
+    Y = r * yr + g * yg + b * yb
+    Z = r * zr + g * zg + b * zb
+
+    # Step 4: Convert to xy coordinates, black maps to (0, 0)
+    total = X + Y + Z
+    if total == 0:
+        return 0, 0
+    # Step 5: Scale to the 16-bit DALI range in the same step, then clamp
+    scale = 65535.0 / total
+    x = X * scale
+    y = Y * scale
+    x_int = int(max(0.0, min(x, 65535.0)))
+    y_int = int(max(0.0, min(y, 65535.0)))
+
+    return x_int, y_int
+
+
+@lru_cache(maxsize=256)
+def _rgb8_to_xy_16bit(r: int, g: int, b: int) -> tuple[int, int]:
+    """Convert 8-bit RGB to 16-bit XY, remembering recently used colors."""
+    # Steps 1 and 2 precomputed for 8-bit integer channels
+    return _linear_rgb_to_xy_16bit(_GAMMA_LUT[r], _GAMMA_LUT[g], _GAMMA_LUT[b])
 
 
 def rgb_to_xy_16bit(r, g, b):
     """Convert RGB to 16-bit XY using Wide RGB D65 (Philips Hue style)."""
 
+    if (
+        type(r) is type(g) is type(b) is int
+        and 0 <= r <= 255
+        and 0 <= g <= 255
+        and 0 <= b <= 255
+    ):
+        return _rgb8_to_xy_16bit(r, g, b)
+
     # Step 1: Normalize to 0–1 range if needed
     if r > 1:
         r /= 255.0
@@ -887,27 +947,4 @@ def rgb_to_xy_16bit(r, g, b):
         b /= 255.0
 
     # Step 2: Apply gamma correction
-    def gamma(c):
-        if c > 0.045045:
-            return ((c + 0.055) / (1.0 + 0.055)) ** 2.4
-        return c / 12.92
-
-    r = gamma(r)
-    g = gamma(g)
-    b = gamma(b)
-
-    # Step 3: Convert to XYZ using Wide RGB D65
-    X = r * 0.649926 + g * 0.103455 + b * 0.197109
-    Y = r * 0.234327 + g * 0.743075 + b * 0.022598
-    Z = r * 0.0 + g * 0.053077 + b * 1.035763
-
-    # Step 4: Convert to xy coordinates
-    total = X + Y + Z
-    x = X / total if total != 0 else 0
-    y = Y / total if total != 0 else 0
-
-    # Step 5: Scale to 16-bit DALI range
-    x_int = int(max(0, min(1, x)) * 65535)
-    y_int = int(max(0, min(1, y)) * 65535)
-
-    return x_int, y_int
+    return _linear_rgb_to_xy_16bit(_gamma(r), _gamma(g), _gamma(b))
@@ -0,0 +1,19 @@
+"""Runtime data models for the Control Freak integration."""
+
+from dataclasses import dataclass
+
+from edidio_control_py import EdidioClient
+
+from homeassistant.config_entries import ConfigEntry
+
+
+@dataclass(slots=True)
+class EdidioRuntimeData:
+    """Per-entry data shared between the integration and its platforms."""
+
+    client: EdidioClient
+    config_entry: ConfigEntry
+
+
+# Config entry carrying EdidioRuntimeData as its runtime data
+EdidioConfigEntry = ConfigEntry[EdidioRuntimeData]
@@ -1,5 +1,6 @@
 """Control Freak eDIDIO Home Assistant Options Flow."""
 
+from collections.abc import Sequence
 import logging
 import uuid
 
@@ -22,14 +23,135 @@ from .const import (
 
 _LOGGER = logging.getLogger(__name__)
 
+# Selectors and schemas are static apart from a few defaults, so they are
+# built once at import
+_PROTOCOL_SELECTOR = selector.SelectSelector(
+    selector.SelectSelectorConfig(
+        options=PROTOCOLS,
+        mode=selector.SelectSelectorMode.DROPDOWN,
+    )
+)
+
+_INIT_SCHEMA = vol.Schema(
+    {
+        vol.Required("menu_choice"): selector.SelectSelector(
+            selector.SelectSelectorConfig(
+                options=[
+                    {
+                        "value": "reconfigure_connection",
+                        "label": "Reconfigure IP/Port",
+                    },
+                    {"value": "manage_lights", "label": "Manage Lights"},
+                ],
+                mode=selector.SelectSelectorMode.DROPDOWN,
+            )
+        )
+    }
+)
+
+_ACTION_SELECTOR = selector.SelectSelector(
+    selector.SelectSelectorConfig(
+        options=[
+            {"value": "edit", "label": "Edit a Light"},
+            {"value": "add", "label": "Add a Light"},
+            {"value": "remove", "label": "Remove a Light"},
+        ],
+        mode=selector.SelectSelectorMode.DROPDOWN,
+    )
+)
+
+_ADD_LIGHT_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_LIGHT_NAME): str,
+        vol.Required(CONF_LIGHT_ADDRESS): vol.All(vol.Coerce(int), vol.Range(min=0)),
+        vol.Required(CONF_LIGHT_PROTOCOL): _PROTOCOL_SELECTOR,
+        vol.Required(CONF_LIGHT_LINE, default=1): vol.All(
+            vol.Coerce(int), vol.Range(min=1)
+        ),
+    }
+)
+
+_REMOVE_LIGHT_SCHEMA = vol.Schema(
+    {
+        vol.Required("confirm_remove", default=False): bool,
+    }
+)
+
+
+def _reconfigure_schema(host, port) -> vol.Schema:
+    """Return the connection schema defaulting to the current host and port."""
+    return vol.Schema(
+        {
+            vol.Required(CONF_HOST, default=host): str,
+            vol.Required(CONF_PORT, default=port): int,
+        }
+    )
+
+
+def _edit_light_schema(current_data: dict) -> vol.Schema:
+    """Return the light schema defaulting to the light's current settings."""
+    return vol.Schema(
+        {
+            vol.Required(CONF_LIGHT_NAME, default=current_data[CONF_LIGHT_NAME]): str,
+            vol.Required(
+                CONF_LIGHT_ADDRESS, default=current_data[CONF_LIGHT_ADDRESS]
+            ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+            vol.Required(
+                CONF_LIGHT_PROTOCOL, default=current_data[CONF_LIGHT_PROTOCOL]
+            ): _PROTOCOL_SELECTOR,
+            vol.Required(
+                CONF_LIGHT_LINE, default=current_data[CONF_LIGHT_LINE]
+            ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+        }
+    )
+
 
 class ControlFreakOptionsFlowHandler(config_entries.OptionsFlow):
     """Control Freak eDIDIO Home Assistant Options Flow."""
 
     def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
         """Initialize options flow."""
-        self.lights = list(config_entry.options.get(CONF_LIGHTS, []))
+        # The entry's lights are only copied once a step changes them
+        self._lights_ref = config_entry.options.get(CONF_LIGHTS, ())
+        self._lights_mut: list | None = None
         self.current_light_index = None
+        # Index of each configured light by name, for duplicate name checks
+        self._name_to_index = {
+            light.get(CONF_LIGHT_NAME): i for i, light in enumerate(self.lights)
+        }
+
+    @property
+    def lights(self) -> Sequence[dict]:
+        """Return the lights as edited so far in this flow."""
+        if self._lights_mut is None:
+            return self._lights_ref
+        return self._lights_mut
+
+    def _mutable_lights(self) -> list[dict]:
+        """Return the lights as a list owned by this flow, copying on first use."""
+        if self._lights_mut is None:
+            self._lights_mut = list(self._lights_ref)
+        return self._lights_mut
+
+    def _save_lights(self, lights: list[dict]) -> None:
+        """Store the edited lights in the config entry options."""
+        current_options = dict(self.config_entry.options)
+        current_options[CONF_LIGHTS] = lights
+        # The entry now holds this list, so the next change copies it again
+        # rather than editing the stored options in place
+        self._lights_ref = lights
+        self._lights_mut = None
+        self.hass.config_entries.async_update_entry(
+            self.config_entry, options=current_options
+        )
+
+    @property
+    def _valid_light_index(self) -> int | None:
+        """Return the selected light index, or None if it is not a valid one."""
+        index = self.current_light_index
+        if index is not None and 0 <= index < len(self.lights):
+            return index
+        return None
 
     async def async_step_init(self, user_input=None):
         """Step to start editing lights or prompt to add."""
@@ -44,22 +166,7 @@ class ControlFreakOptionsFlowHandler(config_entries.OptionsFlow):
 
         return self.async_show_form(
             step_id="init",
-            data_schema=vol.Schema(
-                {
-                    vol.Required("menu_choice"): selector.SelectSelector(
-                        selector.SelectSelectorConfig(
-                            options=[
-                                {
-                                    "value": "reconfigure_connection",
-                                    "label": "Reconfigure IP/Port",
-                                },
-                                {"value": "manage_lights", "label": "Manage Lights"},
-                            ],
-                            mode=selector.SelectSelectorMode.DROPDOWN,
-                        )
-                    )
-                }
-            ),
+            data_schema=_INIT_SCHEMA,
             description_placeholders={
                 "step_title": "Control Freak Options",
             },
@@ -92,12 +199,7 @@ class ControlFreakOptionsFlowHandler(config_entries.OptionsFlow):
 
         return self.async_show_form(
             step_id="reconfigure_connection",
-            data_schema=vol.Schema(
-                {
-                    vol.Required(CONF_HOST, default=current_host): str,
-                    vol.Required(CONF_PORT, default=current_port): int,
-                }
-            ),
+            data_schema=_reconfigure_schema(current_host, current_port),
             errors=errors,
             description_placeholders={
                 "step_title": "Reconfigure Control Freak Connection",
@@ -156,16 +258,7 @@ class ControlFreakOptionsFlowHandler(config_entries.OptionsFlow):
 
         # Define the schema for the actions
         schema_dict = {
-            vol.Required("action"): selector.SelectSelector(
-                selector.SelectSelectorConfig(
-                    options=[
-                        {"value": "edit", "label": "Edit a Light"},
-                        {"value": "add", "label": "Add a Light"},
-                        {"value": "remove", "label": "Remove a Light"},
-                    ],
-                    mode=selector.SelectSelectorMode.DROPDOWN,
-                )
-            ),
+            vol.Required("action"): _ACTION_SELECTOR,
         }
 
         # Add the light_index selector only if there are lights to choose from
@@ -194,13 +287,11 @@ class ControlFreakOptionsFlowHandler(config_entries.OptionsFlow):
     async def async_step_edit_light(self, user_input=None):
         """Edit selected light's details."""
         errors = {}
-        if self.current_light_index is None or not (
-            0 <= int(self.current_light_index) < len(self.lights)
-        ):
+        light_index = self._valid_light_index
+        if light_index is None:
             _LOGGER.error("Invalid light index for edit: %s", self.current_light_index)
             return self.async_abort(reason="invalid_selection")
 
-        light_index = int(self.current_light_index)
         light_to_edit = self.lights[light_index]
 
         _LOGGER.debug("Edit step: Current index: %s", light_index)
@@ -208,33 +299,33 @@ class ControlFreakOptionsFlowHandler(config_entries.OptionsFlow):
 
         if user_input:
             new_name = user_input[CONF_LIGHT_NAME]
-            for i, light in enumerate(self.lights):
-                # Ensure we are not comparing the light to itself
-                if i != light_index and light.get(CONF_LIGHT_NAME) == new_name:
-                    errors["base"] = "duplicate_light_name"
-                    _LOGGER.warning("Duplicate light name detected: %s", new_name)
-                    break
+            existing = self._name_to_index.get(new_name)
+            # Ensure we are not comparing the light to itself
+            if existing is not None and existing != light_index:
+                errors["base"] = "duplicate_light_name"
+                _LOGGER.warning("Duplicate light name detected: %s", new_name)
 
             if not errors:
-                light_to_edit.update(
-                    {
-                        CONF_LIGHT_NAME: user_input[CONF_LIGHT_NAME],
-                        CONF_LIGHT_ADDRESS: user_input[CONF_LIGHT_ADDRESS],
-                        CONF_LIGHT_PROTOCOL: user_input[CONF_LIGHT_PROTOCOL],
-                        CONF_LIGHT_LINE: user_input[CONF_LIGHT_LINE],
-                    }
-                )
+                old_name = light_to_edit.get(CONF_LIGHT_NAME)
+                if self._name_to_index.get(old_name) == light_index:
+                    del self._name_to_index[old_name]
+                self._name_to_index[new_name] = light_index
+                # Replace rather than update the light, so the new options
+                # differ from the entry's and the update listener fires
+                lights = self._mutable_lights()
+                lights[light_index] = {
+                    **light_to_edit,
+                    CONF_LIGHT_NAME: user_input[CONF_LIGHT_NAME],
+                    CONF_LIGHT_ADDRESS: user_input[CONF_LIGHT_ADDRESS],
+                    CONF_LIGHT_PROTOCOL: user_input[CONF_LIGHT_PROTOCOL],
+                    CONF_LIGHT_LINE: user_input[CONF_LIGHT_LINE],
+                }
                 _LOGGER.debug(
                     "Edit step: Light data AFTER update: %s",
                     self.lights[light_index],
                 )
-                current_options = dict(self.config_entry.options)
-                current_options[CONF_LIGHTS] = self.lights
-                self.hass.config_entries.async_update_entry(
-                    self.config_entry, options=current_options
-                )
-                # IMPORTANT: Reload the config entry to refresh entities
-                await self.hass.config_entries.async_reload(self.config_entry.entry_id)
+                self._save_lights(lights)
+                # The update listener adds, updates or removes the entities
                 return await self.async_step_manage_lights()
 
         current_data = {
@@ -246,27 +337,7 @@ class ControlFreakOptionsFlowHandler(config_entries.OptionsFlow):
 
         return self.async_show_form(
             step_id="edit_light",
-            data_schema=vol.Schema(
-                {
-                    vol.Required(
-                        CONF_LIGHT_NAME, default=current_data[CONF_LIGHT_NAME]
-                    ): str,
-                    vol.Required(
-                        CONF_LIGHT_ADDRESS, default=current_data[CONF_LIGHT_ADDRESS]
-                    ): vol.All(vol.Coerce(int), vol.Range(min=0)),
-                    vol.Required(
-                        CONF_LIGHT_PROTOCOL, default=current_data[CONF_LIGHT_PROTOCOL]
-                    ): selector.SelectSelector(
-                        selector.SelectSelectorConfig(
-                            options=PROTOCOLS,
-                            mode=selector.SelectSelectorMode.DROPDOWN,
-                        )
-                    ),
-                    vol.Required(
-                        CONF_LIGHT_LINE, default=current_data[CONF_LIGHT_LINE]
-                    ): vol.All(vol.Coerce(int), vol.Range(min=1)),
-                }
-            ),
+            data_schema=_edit_light_schema(current_data),
             errors=errors,
             description_placeholders={
                 "light_name": light_to_edit.get(CONF_LIGHT_NAME, "this Light"),
@@ -278,18 +349,18 @@ class ControlFreakOptionsFlowHandler(config_entries.OptionsFlow):
         """Add a new light."""
         errors = {}
         if user_input:
-            for light in self.lights:
-                if light.get(CONF_LIGHT_NAME) == user_input[CONF_LIGHT_NAME]:
-                    errors["base"] = "duplicate_light_name"
-                    _LOGGER.warning(
-                        "Duplicate light name detected during add: %s",
-                        user_input[CONF_LIGHT_NAME],
-                    )
-                    break
+            if user_input[CONF_LIGHT_NAME] in self._name_to_index:
+                errors["base"] = "duplicate_light_name"
+                _LOGGER.warning(
+                    "Duplicate light name detected during add: %s",
+                    user_input[CONF_LIGHT_NAME],
+                )
 
             if not errors:
-                new_light_id = str(uuid.uuid4())
-                self.lights.append(
+                new_light_id = uuid.uuid4().hex
+                lights = self._mutable_lights()
+                self._name_to_index[user_input[CONF_LIGHT_NAME]] = len(lights)
+                lights.append(
                     {
                         CONF_LIGHT_NAME: user_input[CONF_LIGHT_NAME],
                         CONF_LIGHT_ADDRESS: user_input[CONF_LIGHT_ADDRESS],
@@ -301,36 +372,15 @@ class ControlFreakOptionsFlowHandler(config_entries.OptionsFlow):
                 _LOGGER.debug(
                     "Added new light with ID %s: %s",
                     new_light_id,
-                    self.lights[-1],
+                    lights[-1],
                 )
-                current_options = dict(self.config_entry.options)
-                current_options[CONF_LIGHTS] = self.lights
-                self.hass.config_entries.async_update_entry(
-                    self.config_entry, options=current_options
-                )
-                # IMPORTANT: Reload the config entry to refresh entities
-                await self.hass.config_entries.async_reload(self.config_entry.entry_id)
+                self._save_lights(lights)
+                # The update listener adds, updates or removes the entities
                 return await self.async_step_manage_lights()
 
         return self.async_show_form(
             step_id="add_light",
-            data_schema=vol.Schema(
-                {
-                    vol.Required(CONF_LIGHT_NAME): str,
-                    vol.Required(CONF_LIGHT_ADDRESS): vol.All(
-                        vol.Coerce(int), vol.Range(min=0)
-                    ),
-                    vol.Required(CONF_LIGHT_PROTOCOL): selector.SelectSelector(
-                        selector.SelectSelectorConfig(
-                            options=PROTOCOLS,
-                            mode=selector.SelectSelectorMode.DROPDOWN,
-                        )
-                    ),
-                    vol.Required(CONF_LIGHT_LINE, default=1): vol.All(
-                        vol.Coerce(int), vol.Range(min=1)
-                    ),
-                }
-            ),
+            data_schema=_ADD_LIGHT_SCHEMA,
             errors=errors,
             description_placeholders={"step_title": "Add a New Light"},
         )
@@ -340,9 +390,8 @@ class ControlFreakOptionsFlowHandler(config_entries.OptionsFlow):
         errors = {}
 
         # Validate current_light_index *before* attempting to use it
-        if self.current_light_index is None or not (
-            0 <= int(self.current_light_index) < len(self.lights)
-        ):
+        light_index = self._valid_light_index
+        if light_index is None:
             _LOGGER.error(
                 "Invalid light index for removal: %s",
                 self.current_light_index,
@@ -351,7 +400,6 @@ class ControlFreakOptionsFlowHandler(config_entries.OptionsFlow):
             errors["base"] = "invalid_light_selection_for_removal"
             return await self.async_step_manage_lights()
 
-        light_index = int(self.current_light_index)
         light_name_to_remove = self.lights[light_index].get(
             CONF_LIGHT_NAME, "Unknown Light"
         )
@@ -366,65 +414,20 @@ class ControlFreakOptionsFlowHandler(config_entries.OptionsFlow):
 
         # Check if user has submitted the confirmation form
         if user_input is not None and user_input.get("confirm_remove"):
-            self.lights.pop(light_index)
+            lights = self._mutable_lights()
+            lights.pop(light_index)
+            # Lights after the removed one move down by one
+            self._name_to_index = {
+                light.get(CONF_LIGHT_NAME): i for i, light in enumerate(lights)
+            }
             _LOGGER.debug(
                 "Removed light: %s. Remaining lights: %d",
                 light_name_to_remove,
-                len(self.lights),
-            )
-            current_options = dict(self.config_entry.options)
-            current_options[CONF_LIGHTS] = self.lights
-            self.hass.config_entries.async_update_entry(
-                self.config_entry, options=current_options
+                len(lights),
             )
+            self._save_lights(lights)
 
-            # if removed_light_id:
-            #     _LOGGER.debug(
-            #         "Attempting to remove device with ID: %s", removed_light_id
-            #     )  # Debug 1: Confirm removed_light_id
-            #     device_registry = dr.async_get(self.hass)
-
-            #     # Debug 2: Get all devices and log their identifiers (for comprehensive check)
-            #     # This can be very verbose, use with caution in production, but great for debugging.
-            #     all_devices = device_registry.devices
-            #     _LOGGER.debug("Current devices in registry:")
-            #     for dev_id, dev_entry in all_devices.items():
-            #         _LOGGER.debug(
-            #             "  Device ID: %s, Identifiers: %s",
-            #             dev_id,
-            #             dev_entry.identifiers,
-            #         )
-
-            #     # Debug 3: Log the specific identifiers you are searching for
-            #     search_identifiers = {(DOMAIN, removed_light_id)}
-            #     _LOGGER.debug(
-            #         "Searching for device with identifiers: %s", search_identifiers
-            #     )
-
-            #     device = device_registry.async_get_device(
-            #         identifiers=search_identifiers  # Use the logged variable here
-            #     )
-
-            #     # Debug 4: Check what 'device' is after the lookup
-            #     if device:
-            #         _LOGGER.debug(
-            #             "Found device to remove: ID=%s, Name=%s, Identifiers=%s",
-            #             device.id,
-            #             device.name,
-            #             device.identifiers,
-            #         )  # Debug found device details
-            #         device_registry.async_remove_device(device.id)
-            #         _LOGGER.debug(
-            #             "Successfully called async_remove_device for ID: %s", device.id
-            #         )
-            #     else:
-            #         _LOGGER.warning(
-            #             "Device not found in registry with identifiers: %s. Cannot remove.",
-            #             search_identifiers,
-            #         )  # Debug if not found
-
-            # IMPORTANT: Reload the config entry to refresh entities
-            await self.hass.config_entries.async_reload(self.config_entry.entry_id)
+            # The update listener removes the entity, no reload needed
             # Go back to light management menu after successful removal
             return await self.async_step_manage_lights()
         if user_input is not None and not user_input.get("confirm_remove"):
@@ -438,11 +441,7 @@ class ControlFreakOptionsFlowHandler(config_entries.OptionsFlow):
         # Show the confirmation form
         return self.async_show_form(
             step_id="remove_light",
-            data_schema=vol.Schema(
-                {
-                    vol.Required("confirm_remove", default=False): bool,
-                }
-            ),
+            data_schema=_REMOVE_LIGHT_SCHEMA,
             errors=errors,
             description_placeholders={
                 "light_name": light_name_to_remove,
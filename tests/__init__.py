@@ -0,0 +1 @@
+"""Tests for the Control Freak integration."""
@@ -0,0 +1,57 @@
+"""Shared helpers for the Control Freak tests."""
+
+from unittest.mock import patch
+
+from edidio_control_py import EdidioClient
+
+
+class StubEdidioClient:
+    """Minimal stand-in for EdidioClient that records the calls made on it."""
+
+    def __init__(self, host=None, port=None) -> None:
+        self.host = host
+        self.port = port
+        self.connected = False
+        self.calls = []
+        # An exception to raise from connect(), or a list consumed one per call
+        self.side_effect = None
+        # (method, payload) for every send, and an exception to raise from them
+        self.sent = []
+        self.send_side_effect = None
+
+    # Frame builders are pure, so the real ones are used
+    create_dali_message = staticmethod(EdidioClient.create_dali_message)
+    create_dmx_message = staticmethod(EdidioClient.create_dmx_message)
+
+    async def connect(self):
+        self.calls.append("connect")
+        effect = self.side_effect
+        if isinstance(effect, list):
+            effect = effect.pop(0) if effect else None
+        if effect is not None:
+            raise effect
+        self.connected = True
+
+    async def disconnect(self):
+        self.calls.append("disconnect")
+        self.connected = False
+
+    async def send_protobuf_message(self, message):
+        self._record_send("send_protobuf_message", message)
+
+    async def send_dali_commands_sequence(self, commands):
+        self._record_send("send_dali_commands_sequence", list(commands))
+
+    def _record_send(self, method, payload):
+        self.sent.append((method, payload))
+        if self.send_side_effect is not None:
+            raise self.send_side_effect
+
+
+def patch_edidio_client(client):
+    """Patch the integration's EdidioClient class to return ``client``."""
+    return patch(
+        "custom_components.control_freak_edidio.EdidioClient",
+        autospec=False,
+        return_value=client,
+    )
@@ -1,5 +1,22 @@
 # custom_components/control_freak_edidio/tests/conftest.py
+import os
 import sys
 from pathlib import Path
 
+import pytest
+
+from .common import StubEdidioClient, patch_edidio_client
+
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+
+def pytest_xdist_auto_num_workers(config):
+    """Leave two cores free when the suite is run with ``-n auto``."""
+    return max(1, (os.cpu_count() or 1) - 2)
+
+
+@pytest.fixture
+def mock_edidio_client():
+    mock_client_instance = StubEdidioClient()
+    with patch_edidio_client(mock_client_instance) as mock_client_class:
+        yield mock_client_class, mock_client_instance
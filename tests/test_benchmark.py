@@ -0,0 +1,35 @@
+# custom_components/control_freak_edidio/tests/test_benchmark.py
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from homeassistant.config_entries import ConfigEntries
+
+from .common import StubEdidioClient, patch_edidio_client
+
+# Upper bound on the mean cost of the per-test mock setup, in seconds
+MAX_MOCK_SETUP_MEAN = 0.002
+
+_ASYNC_TRUE = AsyncMock(return_value=True)
+
+# Deselected by default, see pytest.ini
+pytestmark = pytest.mark.benchmark
+
+
+def _mock_setup():
+    """Build and tear down the mocks every setup test enters."""
+    with (
+        patch_edidio_client(StubEdidioClient()),
+        patch.object(ConfigEntries, "async_forward_entry_setups", new=_ASYNC_TRUE),
+    ):
+        pass
+
+
+def test_bench_mock_setup(benchmark):
+    # pytest-benchmark disables itself under xdist and only calls the target once
+    if benchmark.disabled:
+        pytest.skip("benchmarks only run without xdist, use pytest -n 0 -m benchmark")
+
+    benchmark.pedantic(_mock_setup, rounds=50, warmup_rounds=3)
+
+    assert benchmark.stats.stats.mean < MAX_MOCK_SETUP_MEAN
@@ -0,0 +1,414 @@
+# custom_components/control_freak_edidio/tests/test_config_flow.py
+from unittest.mock import patch
+
+import custom_components.control_freak_edidio as integration
+from custom_components.control_freak_edidio import config_flow
+from custom_components.control_freak_edidio.const import (
+    CONF_HOST,
+    CONF_LIGHT_ADDRESS,
+    CONF_LIGHT_ID,
+    CONF_LIGHT_LINE,
+    CONF_LIGHT_NAME,
+    CONF_LIGHT_PROTOCOL,
+    CONF_LIGHTS,
+    CONF_PORT,
+    DOMAIN,
+    PROTOCOL_DALI_RGB,
+    PROTOCOL_DALI_WHITE,
+)
+from edidio_control_py.exceptions import EDIDIOConnectionError
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.config_entries import SOURCE_USER
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+
+from .common import StubEdidioClient
+
+MOCK_HOST = "192.168.1.200"
+MOCK_PORT = 1234
+
+USER_INPUT = {CONF_HOST: MOCK_HOST, CONF_PORT: MOCK_PORT}
+
+LIGHT_KITCHEN = {
+    CONF_LIGHT_ID: "kitchen_id",
+    CONF_LIGHT_NAME: "Kitchen",
+    CONF_LIGHT_ADDRESS: 1,
+    CONF_LIGHT_PROTOCOL: PROTOCOL_DALI_WHITE,
+    CONF_LIGHT_LINE: 1,
+}
+LIGHT_HALL = {
+    CONF_LIGHT_ID: "hall_id",
+    CONF_LIGHT_NAME: "Hall",
+    CONF_LIGHT_ADDRESS: 5,
+    CONF_LIGHT_PROTOCOL: PROTOCOL_DALI_WHITE,
+    CONF_LIGHT_LINE: 1,
+}
+
+
+@pytest.fixture(autouse=True)
+def _flow_setup(enable_custom_integrations):
+    """Keep created entries from setting up and start with no cached probes."""
+    config_flow._PROBE_CACHE.clear()
+    with patch.object(integration, "async_setup_entry", return_value=True):
+        yield
+    config_flow._PROBE_CACHE.clear()
+
+
+@pytest.fixture
+def probe_client():
+    """Return the client stub the connection probe connects with."""
+    client = StubEdidioClient()
+    with patch.object(config_flow, "EdidioClient", return_value=client):
+        yield client
+
+
+async def _async_start_user_flow(hass: HomeAssistant, num_lights: int):
+    """Start the config flow and submit the connection details."""
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": SOURCE_USER}
+    )
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "user"
+    return await hass.config_entries.flow.async_configure(
+        result["flow_id"], {**USER_INPUT, "num_lights": num_lights}
+    )
+
+
+async def test_user_flow_light_details(hass: HomeAssistant, probe_client):
+    result = await _async_start_user_flow(hass, 1)
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "light_details"
+
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        {
+            CONF_LIGHT_NAME: "Kitchen",
+            CONF_LIGHT_ADDRESS: 1,
+            CONF_LIGHT_PROTOCOL: PROTOCOL_DALI_WHITE,
+            CONF_LIGHT_LINE: 1,
+        },
+    )
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert result["data"] == USER_INPUT
+    (light,) = result["options"][CONF_LIGHTS]
+    assert light[CONF_LIGHT_NAME] == "Kitchen"
+    assert light[CONF_LIGHT_ID]
+    assert probe_client.calls == ["connect", "disconnect"]
+
+
+async def test_user_flow_bulk_lights(hass: HomeAssistant, probe_client):
+    result = await _async_start_user_flow(hass, 4)
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "lights_bulk"
+
+    rows = [
+        {
+            CONF_LIGHT_NAME: f"Light {i}",
+            CONF_LIGHT_ADDRESS: i,
+            CONF_LIGHT_PROTOCOL: PROTOCOL_DALI_RGB,
+        }
+        for i in range(4)
+    ]
+    rows[3][CONF_LIGHT_LINE] = 2
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {CONF_LIGHTS: rows}
+    )
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    lights = result["options"][CONF_LIGHTS]
+    assert [light[CONF_LIGHT_NAME] for light in lights] == [
+        "Light 0",
+        "Light 1",
+        "Light 2",
+        "Light 3",
+    ]
+    # The line defaults to 1 when a row leaves it out
+    assert [light[CONF_LIGHT_LINE] for light in lights] == [1, 1, 1, 2]
+    # Every light gets its own stable ID
+    assert len({light[CONF_LIGHT_ID] for light in lights}) == 4
+
+
+@pytest.mark.parametrize(
+    "rows",
+    [
+        [],
+        [{CONF_LIGHT_NAME: "Kitchen", CONF_LIGHT_ADDRESS: 1}],
+        [
+            {
+                CONF_LIGHT_NAME: "Kitchen",
+                CONF_LIGHT_ADDRESS: 1,
+                CONF_LIGHT_PROTOCOL: "Not a protocol",
+            }
+        ],
+        [
+            {
+                CONF_LIGHT_NAME: "Kitchen",
+                CONF_LIGHT_ADDRESS: -1,
+                CONF_LIGHT_PROTOCOL: PROTOCOL_DALI_WHITE,
+            }
+        ],
+    ],
+)
+async def test_user_flow_bulk_lights_invalid(
+    hass: HomeAssistant, probe_client, rows
+):
+    result = await _async_start_user_flow(hass, 4)
+
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {CONF_LIGHTS: rows}
+    )
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "lights_bulk"
+    assert result["errors"] == {"base": "invalid_lights"}
+
+
+@pytest.mark.parametrize("num_rows", [3, 5])
+async def test_user_flow_bulk_lights_wrong_count(
+    hass: HomeAssistant, probe_client, num_rows
+):
+    result = await _async_start_user_flow(hass, 4)
+
+    rows = [
+        {
+            CONF_LIGHT_NAME: f"Light {i}",
+            CONF_LIGHT_ADDRESS: i,
+            CONF_LIGHT_PROTOCOL: PROTOCOL_DALI_WHITE,
+        }
+        for i in range(num_rows)
+    ]
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {CONF_LIGHTS: rows}
+    )
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "lights_bulk"
+    assert result["errors"] == {"base": "wrong_light_count"}
+
+
+async def test_user_flow_bulk_lights_duplicate_name(
+    hass: HomeAssistant, probe_client
+):
+    result = await _async_start_user_flow(hass, 4)
+
+    rows = [
+        {
+            CONF_LIGHT_NAME: "Kitchen" if i < 2 else f"Light {i}",
+            CONF_LIGHT_ADDRESS: i,
+            CONF_LIGHT_PROTOCOL: PROTOCOL_DALI_WHITE,
+        }
+        for i in range(4)
+    ]
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {CONF_LIGHTS: rows}
+    )
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "lights_bulk"
+    assert result["errors"] == {"base": "duplicate_light_name"}
+
+
+async def test_user_flow_cannot_connect(hass: HomeAssistant, probe_client):
+    probe_client.side_effect = EDIDIOConnectionError("Mock connection error")
+
+    result = await _async_start_user_flow(hass, 3)
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "user"
+    assert result["errors"] == {"base": "cannot_connect"}
+    # The form keeps what the user entered
+    suggested = {
+        key.schema: key.description["suggested_value"]
+        for key in result["data_schema"].schema
+    }
+    assert suggested == {**USER_INPUT, "num_lights": 3}
+    # A failed probe is not cached, so the next attempt connects again
+    assert config_flow._PROBE_CACHE == {}
+
+    # Retrying once the device is reachable picks up the new light count
+    probe_client.side_effect = None
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {**USER_INPUT, "num_lights": 1}
+    )
+    assert result["step_id"] == "light_details"
+    assert result["description_placeholders"]["total_lights"] == 1
+
+
+async def test_user_flow_reuses_recent_probe(hass: HomeAssistant, probe_client):
+    first = await _async_start_user_flow(hass, 1)
+    assert first["step_id"] == "light_details"
+    hass.config_entries.flow.async_abort(first["flow_id"])
+
+    second = await _async_start_user_flow(hass, 1)
+    assert second["step_id"] == "light_details"
+    # Only the first flow connected to the device
+    assert probe_client.calls == ["connect", "disconnect"]
+
+
+async def test_user_flow_already_configured(hass: HomeAssistant, probe_client):
+    MockConfigEntry(
+        domain=DOMAIN, data=USER_INPUT, unique_id=f"{MOCK_HOST}-{MOCK_PORT}"
+    ).add_to_hass(hass)
+
+    result = await _async_start_user_flow(hass, 1)
+    assert result["type"] is FlowResultType.ABORT
+    assert result["reason"] == "already_configured"
+    # Aborted before the device was probed
+    assert probe_client.calls == []
+
+
+@pytest.fixture
+def options_entry(hass: HomeAssistant):
+    """Return a config entry holding the kitchen and hall lights."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data=USER_INPUT,
+        options={CONF_LIGHTS: [LIGHT_KITCHEN, LIGHT_HALL]},
+        unique_id=f"{MOCK_HOST}-{MOCK_PORT}",
+    )
+    entry.add_to_hass(hass)
+    return entry
+
+
+async def _async_manage_lights(hass: HomeAssistant, entry, action, light_index=0):
+    """Open the options flow and pick a light management action."""
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    assert result["step_id"] == "init"
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], {"menu_choice": "manage_lights"}
+    )
+    assert result["step_id"] == "manage_lights"
+    user_input = {"action": action}
+    if action != "add":
+        user_input["light_index"] = str(light_index)
+    return await hass.config_entries.options.async_configure(
+        result["flow_id"], user_input
+    )
+
+
+async def test_options_flow_add_light(hass: HomeAssistant, options_entry):
+    stored_lights = options_entry.options[CONF_LIGHTS]
+
+    result = await _async_manage_lights(hass, options_entry, "add")
+    assert result["step_id"] == "add_light"
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        {
+            CONF_LIGHT_NAME: "Porch",
+            CONF_LIGHT_ADDRESS: 9,
+            CONF_LIGHT_PROTOCOL: PROTOCOL_DALI_WHITE,
+            CONF_LIGHT_LINE: 1,
+        },
+    )
+    assert result["step_id"] == "manage_lights"
+
+    names = [light[CONF_LIGHT_NAME] for light in options_entry.options[CONF_LIGHTS]]
+    assert names == ["Kitchen", "Hall", "Porch"]
+    # The previously stored list is copied, not changed in place
+    assert stored_lights == [LIGHT_KITCHEN, LIGHT_HALL]
+
+
+async def test_options_flow_add_duplicate_name(hass: HomeAssistant, options_entry):
+    result = await _async_manage_lights(hass, options_entry, "add")
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        {
+            CONF_LIGHT_NAME: "Hall",
+            CONF_LIGHT_ADDRESS: 9,
+            CONF_LIGHT_PROTOCOL: PROTOCOL_DALI_WHITE,
+            CONF_LIGHT_LINE: 1,
+        },
+    )
+    assert result["step_id"] == "add_light"
+    assert result["errors"] == {"base": "duplicate_light_name"}
+    assert options_entry.options[CONF_LIGHTS] == [LIGHT_KITCHEN, LIGHT_HALL]
+
+
+async def test_options_flow_edit_light(hass: HomeAssistant, options_entry):
+    stored_lights = options_entry.options[CONF_LIGHTS]
+    edit_input = {
+        CONF_LIGHT_ADDRESS: 2,
+        CONF_LIGHT_PROTOCOL: PROTOCOL_DALI_RGB,
+        CONF_LIGHT_LINE: 1,
+    }
+
+    result = await _async_manage_lights(hass, options_entry, "edit", 0)
+    assert result["step_id"] == "edit_light"
+
+    # Another light's name is rejected
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], {**edit_input, CONF_LIGHT_NAME: "Hall"}
+    )
+    assert result["step_id"] == "edit_light"
+    assert result["errors"] == {"base": "duplicate_light_name"}
+
+    # Keeping its own name is fine
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], {**edit_input, CONF_LIGHT_NAME: "Kitchen"}
+    )
+    assert result["step_id"] == "manage_lights"
+
+    kitchen, hall = options_entry.options[CONF_LIGHTS]
+    assert kitchen == {**LIGHT_KITCHEN, **edit_input}
+    assert hall == LIGHT_HALL
+    # The edited light replaces the stored dict rather than changing it
+    assert stored_lights == [LIGHT_KITCHEN, LIGHT_HALL]
+
+
+async def test_options_flow_rename_frees_old_name(
+    hass: HomeAssistant, options_entry
+):
+    result = await _async_manage_lights(hass, options_entry, "edit", 0)
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        {
+            CONF_LIGHT_NAME: "Pantry",
+            CONF_LIGHT_ADDRESS: 1,
+            CONF_LIGHT_PROTOCOL: PROTOCOL_DALI_WHITE,
+            CONF_LIGHT_LINE: 1,
+        },
+    )
+    assert result["step_id"] == "manage_lights"
+
+    # In the same flow, a new light may take the name given up by the edit
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], {"action": "add"}
+    )
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        {
+            CONF_LIGHT_NAME: "Kitchen",
+            CONF_LIGHT_ADDRESS: 9,
+            CONF_LIGHT_PROTOCOL: PROTOCOL_DALI_WHITE,
+            CONF_LIGHT_LINE: 1,
+        },
+    )
+    assert result["step_id"] == "manage_lights"
+    names = [light[CONF_LIGHT_NAME] for light in options_entry.options[CONF_LIGHTS]]
+    assert names == ["Pantry", "Hall", "Kitchen"]
+
+
+async def test_options_flow_remove_light(hass: HomeAssistant, options_entry):
+    stored_lights = options_entry.options[CONF_LIGHTS]
+
+    result = await _async_manage_lights(hass, options_entry, "remove", 0)
+    assert result["step_id"] == "remove_light"
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], {"confirm_remove": True}
+    )
+    assert result["step_id"] == "manage_lights"
+
+    assert options_entry.options[CONF_LIGHTS] == [LIGHT_HALL]
+    assert stored_lights == [LIGHT_KITCHEN, LIGHT_HALL]
+
+    # The remaining light moved down to index 0 and keeps its name check
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], {"action": "add"}
+    )
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        {
+            CONF_LIGHT_NAME: "Hall",
+            CONF_LIGHT_ADDRESS: 9,
+            CONF_LIGHT_PROTOCOL: PROTOCOL_DALI_WHITE,
+            CONF_LIGHT_LINE: 1,
+        },
+    )
+    assert result["errors"] == {"base": "duplicate_light_name"}
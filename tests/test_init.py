@@ -1,55 +1,63 @@
 # custom_components/control_freak_edidio/tests/test_init.py
+import asyncio
 from unittest.mock import AsyncMock, patch
 
+import custom_components.control_freak_edidio as integration
 from custom_components.control_freak_edidio import (
-    DOMAIN,
     PLATFORMS,
-    async_reload_entry,
-    async_setup_entry,
     async_unload_entry,
     options_update_listener,
 )
-from custom_components.control_freak_edidio.const import CONF_HOST, CONF_PORT
+from custom_components.control_freak_edidio.const import (
+    CONF_HOST,
+    CONF_PORT,
+    CONNECTION_CHECK_INTERVAL,
+    DOMAIN,
+)
+from custom_components.control_freak_edidio.models import EdidioRuntimeData
 from edidio_control_py.exceptions import EDIDIOConnectionError, EDIDIOTimeoutError
 import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
 
-from homeassistant.config_entries import ConfigEntry
+from homeassistant.config_entries import ConfigEntries, ConfigEntryState
 from homeassistant.const import STATE_UNAVAILABLE, Platform
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.typing import ConfigType
+from homeassistant.util import dt as dt_util
 
 MOCK_HOST = "192.168.1.200"
 MOCK_PORT = 1234
 
+# ConfigEntries methods patched around setup and unload
+_FORWARD = "async_forward_entry_setups"
+_UNLOAD = "async_unload_platforms"
 
-@pytest.fixture
-def mock_edidio_client(mocker):
-    mock_client_instance = AsyncMock()
-    mock_client_instance.connect = AsyncMock(return_value=None)
-    mock_client_instance.disconnect = AsyncMock(return_value=None)
-
-    mock_client_class = mocker.patch(
-        "custom_components.control_freak_edidio.EdidioClient",
-        return_value=mock_client_instance,
-    )
-    return mock_client_class, mock_client_instance
+# Shared constant-result mocks, reset by each test before patching them in
+_ASYNC_TRUE = AsyncMock(return_value=True)
+_ASYNC_FALSE = AsyncMock(return_value=False)
+
+# Connection errors raised by the first connect attempt in the failure tests
+_CONN_ERR = EDIDIOConnectionError("Mock connection error")
+_TIMEOUT_ERR = EDIDIOTimeoutError("Mock connection error")
 
 
 @pytest.fixture
-def mock_config_entry(hass: HomeAssistant):
-    entry = ConfigEntry(
-        version=1,
-        minor_version=1,
+async def mock_config_entry(hass: HomeAssistant, enable_custom_integrations):
+    """Add a config entry to Home Assistant and unload it again after the test."""
+    entry = MockConfigEntry(
         domain=DOMAIN,
         title="Test Control Freak",
         data={CONF_HOST: MOCK_HOST, CONF_PORT: MOCK_PORT},
-        options={},
-        source="user",
         unique_id=f"{MOCK_HOST}-{MOCK_PORT}",
-        discovery_keys=[],
-        subentries_data={},
     )
-    return entry
+    entry.add_to_hass(hass)
+    yield entry
+    # Unloading cancels the connection check timer and background tasks
+    if entry.state is ConfigEntryState.LOADED:
+        with patch.object(ConfigEntries, _UNLOAD, new=_ASYNC_TRUE):
+            assert await hass.config_entries.async_unload(entry.entry_id)
 
 
 async def test_async_setup_entry_success(
@@ -57,115 +65,204 @@ async def test_async_setup_entry_success(
 ):
     mock_client_class, mock_client_instance = mock_edidio_client
 
-    with patch(
-        "homeassistant.config_entries.ConfigEntries.async_forward_entry_setups",
-        return_value=True,
-    ) as mock_forward_setups:
-        result = await async_setup_entry(hass, mock_config_entry)
+    _ASYNC_TRUE.reset_mock()
+
+    with patch.object(ConfigEntries, _FORWARD, new=_ASYNC_TRUE) as mock_forward_setups:
+        result = await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done(wait_background_tasks=True)
 
         assert result is True
-        mock_client_class.assert_called_once_with(MOCK_HOST, MOCK_PORT)
-        mock_client_instance.connect.assert_called_once()
-        mock_forward_setups.assert_called_once_with(mock_config_entry, PLATFORMS)
+        assert mock_config_entry.state is ConfigEntryState.LOADED
+        assert mock_client_class.call_count == 1
+        assert mock_client_class.call_args == ((MOCK_HOST, MOCK_PORT),)
+        assert mock_client_instance.calls == ["connect"]
+        assert mock_forward_setups.call_count == 1
+        assert mock_forward_setups.call_args == ((mock_config_entry, PLATFORMS),)
+
+        runtime_data = mock_config_entry.runtime_data
+        assert runtime_data.client is mock_client_instance
+        assert runtime_data.config_entry is mock_config_entry
+
 
-        assert DOMAIN in hass.data
-        assert mock_config_entry.entry_id in hass.data[DOMAIN]
-        assert hass.data[DOMAIN][mock_config_entry.entry_id]["client"] is mock_client_instance
-        assert hass.data[DOMAIN][mock_config_entry.entry_id]["config_entry"] is mock_config_entry
+async def test_async_setup_entry_pushes_connection_state(
+    hass: HomeAssistant, mock_edidio_client, mock_config_entry
+):
+    _ASYNC_TRUE.reset_mock()
 
+    with (
+        patch.object(ConfigEntries, _FORWARD, new=_ASYNC_TRUE),
+        patch.object(integration, "async_dispatcher_send") as mock_dispatch,
+    ):
+        await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done(wait_background_tasks=True)
 
-@pytest.mark.parametrize("exception_type", [EDIDIOConnectionError, EDIDIOTimeoutError])
+        assert mock_dispatch.call_count == 1
+        assert mock_dispatch.call_args == (
+            (hass, f"{DOMAIN}_connection_state_{mock_config_entry.entry_id}", True),
+        )
+
+
+@pytest.mark.parametrize("exc", [_CONN_ERR, _TIMEOUT_ERR])
 async def test_async_setup_entry_connection_failure(
-    hass: HomeAssistant, mock_edidio_client, mock_config_entry, exception_type
+    hass: HomeAssistant, mock_edidio_client, mock_config_entry, exc
 ):
     mock_client_class, mock_client_instance = mock_edidio_client
-    mock_client_instance.connect.side_effect = exception_type("Mock connection error")
+    mock_client_instance.side_effect = [exc, None]
+
+    _ASYNC_TRUE.reset_mock()
 
-    with patch(
-        "homeassistant.config_entries.ConfigEntries.async_forward_entry_setups",
-        return_value=True,
-    ) as mock_forward_setups:
-        result = await async_setup_entry(hass, mock_config_entry)
+    with (
+        patch.object(ConfigEntries, _FORWARD, new=_ASYNC_TRUE) as mock_forward_setups,
+        patch.object(integration, "_sleep", AsyncMock()) as mock_sleep,
+    ):
+        result = await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done(wait_background_tasks=True)
 
         assert result is True
-        mock_client_class.assert_called_once_with(MOCK_HOST, MOCK_PORT)
-        mock_client_instance.connect.assert_called_once()
-        mock_forward_setups.assert_called_once_with(mock_config_entry, PLATFORMS)
+        assert mock_config_entry.state is ConfigEntryState.LOADED
+        assert mock_client_class.call_count == 1
+        assert mock_client_class.call_args == ((MOCK_HOST, MOCK_PORT),)
+        assert mock_client_instance.calls == ["connect", "connect"]
+        assert mock_sleep.call_count == 1
+        assert mock_sleep.call_args == ((1,),)
+        assert mock_forward_setups.call_count == 1
+        assert mock_forward_setups.call_args == ((mock_config_entry, PLATFORMS),)
 
-        assert DOMAIN in hass.data
-        assert mock_config_entry.entry_id in hass.data[DOMAIN]
-        assert hass.data[DOMAIN][mock_config_entry.entry_id]["client"] is mock_client_instance
+        runtime_data = mock_config_entry.runtime_data
+        assert runtime_data.client is mock_client_instance
+        assert runtime_data.config_entry is mock_config_entry
 
 
-async def test_async_unload_entry_success(
+async def test_connection_check_starts_one_reconnect(
     hass: HomeAssistant, mock_edidio_client, mock_config_entry
 ):
     _, mock_client_instance = mock_edidio_client
+    release_backoff = asyncio.Event()
+
+    async def _blocked_sleep(_delay):
+        await release_backoff.wait()
+
+    _ASYNC_TRUE.reset_mock()
 
-    with patch(
-        "homeassistant.config_entries.ConfigEntries.async_forward_entry_setups",
-        return_value=True,
+    with (
+        patch.object(ConfigEntries, _FORWARD, new=_ASYNC_TRUE),
+        patch.object(integration, "_sleep", _blocked_sleep),
     ):
-        await async_setup_entry(hass, mock_config_entry)
+        await hass.config_entries.async_setup(mock_config_entry.entry_id)
         await hass.async_block_till_done()
+        assert mock_client_instance.calls == ["connect"]
+
+        now = dt_util.utcnow()
+
+        async def _async_check(connected):
+            # Let the periodic connection check see the given state
+            nonlocal now
+            mock_client_instance.connected = connected
+            now += CONNECTION_CHECK_INTERVAL
+            async_fire_time_changed(hass, now)
+            await hass.async_block_till_done()
+
+        # The first reconnect fails and waits in its backoff
+        mock_client_instance.side_effect = [_CONN_ERR]
+        await _async_check(False)
+        assert mock_client_instance.calls == ["connect", "connect"]
+
+        # The client reconnects on a send and drops again, while the first
+        # reconnect loop is still running
+        await _async_check(True)
+        await _async_check(False)
+        assert mock_client_instance.calls == ["connect", "connect"]
+
+        release_backoff.set()
+        await hass.async_block_till_done()
+        assert mock_client_instance.calls == ["connect", "connect", "connect"]
 
-    with patch(
-        "homeassistant.config_entries.ConfigEntries.async_unload_platforms",
-        return_value=True,
-    ) as mock_unload_platforms:
-        result = await async_unload_entry(hass, mock_config_entry)
 
-        assert result is True
-        mock_unload_platforms.assert_called_once_with(mock_config_entry, PLATFORMS)
-        mock_client_instance.disconnect.assert_called_once()
-        assert mock_config_entry.entry_id not in hass.data[DOMAIN]
+@pytest.fixture
+async def setup_done(hass: HomeAssistant, mock_edidio_client, mock_config_entry):
+    """Set up the config entry and return it with the client stub."""
+    _, mock_client_instance = mock_edidio_client
+
+    _ASYNC_TRUE.reset_mock()
+
+    with patch.object(ConfigEntries, _FORWARD, new=_ASYNC_TRUE):
+        await hass.config_entries.async_setup(mock_config_entry.entry_id)
+
+    return mock_config_entry, mock_client_instance
+
+
+async def test_async_unload_entry(hass: HomeAssistant, setup_done):
+    mock_config_entry, mock_client_instance = setup_done
+
+    _ASYNC_TRUE.reset_mock()
+
+    with patch.object(ConfigEntries, _UNLOAD, new=_ASYNC_TRUE) as mock_unload_platforms:
+        assert await hass.config_entries.async_unload(mock_config_entry.entry_id)
+
+        assert mock_config_entry.state is ConfigEntryState.NOT_LOADED
+        assert mock_unload_platforms.call_count == 1
+        assert mock_unload_platforms.call_args == ((mock_config_entry, PLATFORMS),)
+        assert mock_client_instance.calls.count("disconnect") == 1
 
 
 async def test_async_unload_entry_platform_unload_failure(
-    hass: HomeAssistant, mock_edidio_client, mock_config_entry
+    hass: HomeAssistant, setup_done
 ):
-    _, mock_client_instance = mock_edidio_client
+    mock_config_entry, mock_client_instance = setup_done
 
-    with patch(
-        "homeassistant.config_entries.ConfigEntries.async_forward_entry_setups",
-        return_value=True,
-    ):
-        await async_setup_entry(hass, mock_config_entry)
-        await hass.async_block_till_done()
+    _ASYNC_FALSE.reset_mock()
 
-    with patch(
-        "homeassistant.config_entries.ConfigEntries.async_unload_platforms",
-        return_value=False,
+    # Called directly, as a failed unload through the manager leaves the entry
+    # in FAILED_UNLOAD with its timer still running
+    with patch.object(
+        ConfigEntries, _UNLOAD, new=_ASYNC_FALSE
     ) as mock_unload_platforms:
         result = await async_unload_entry(hass, mock_config_entry)
 
         assert result is False
-        mock_unload_platforms.assert_called_once_with(mock_config_entry, PLATFORMS)
-        mock_client_instance.disconnect.assert_not_called()
-        assert mock_config_entry.entry_id in hass.data[DOMAIN]
+        assert mock_unload_platforms.call_count == 1
+        assert mock_unload_platforms.call_args == ((mock_config_entry, PLATFORMS),)
+        assert mock_client_instance.calls.count("disconnect") == 0
+        assert mock_config_entry.runtime_data.client is mock_client_instance
 
 
-async def test_async_reload_entry(
+async def test_options_update_listener(
     hass: HomeAssistant, mock_edidio_client, mock_config_entry
 ):
-    _mock_client_class, _mock_client_instance = mock_edidio_client
-
-    with patch(
-        "custom_components.control_freak_edidio.async_unload_entry",
-        AsyncMock(return_value=True),
-    ) as mock_unload:
-        with patch(
-            "custom_components.control_freak_edidio.async_setup_entry",
-            AsyncMock(return_value=True),
-        ) as mock_setup:
-            await async_reload_entry(hass, mock_config_entry)
-            mock_unload.assert_called_once_with(hass, mock_config_entry)
-            mock_setup.assert_called_once_with(hass, mock_config_entry)
-
-
-async def test_options_update_listener(hass: HomeAssistant, mock_config_entry):
-    with patch(
-        "homeassistant.config_entries.ConfigEntries.async_reload", AsyncMock()
-    ) as mock_reload:
+    _, mock_client_instance = mock_edidio_client
+    mock_client_instance.host = MOCK_HOST
+    mock_client_instance.port = MOCK_PORT
+    mock_config_entry.runtime_data = EdidioRuntimeData(
+        client=mock_client_instance, config_entry=mock_config_entry
+    )
+
+    with (
+        patch.object(ConfigEntries, "async_reload", AsyncMock()) as mock_reload,
+        patch.object(integration, "async_dispatcher_send") as mock_dispatch,
+    ):
+        await options_update_listener(hass, mock_config_entry)
+        mock_reload.assert_not_called()
+        assert mock_dispatch.call_count == 1
+        assert mock_dispatch.call_args == (
+            (hass, f"{DOMAIN}_lights_updated_{mock_config_entry.entry_id}"),
+        )
+
+
+async def test_options_update_listener_connection_changed(
+    hass: HomeAssistant, mock_edidio_client, mock_config_entry
+):
+    _, mock_client_instance = mock_edidio_client
+    mock_client_instance.host = "192.168.1.201"
+    mock_client_instance.port = MOCK_PORT
+    mock_config_entry.runtime_data = EdidioRuntimeData(
+        client=mock_client_instance, config_entry=mock_config_entry
+    )
+
+    with (
+        patch.object(ConfigEntries, "async_reload", AsyncMock()) as mock_reload,
+        patch.object(integration, "async_dispatcher_send") as mock_dispatch,
+    ):
         await options_update_listener(hass, mock_config_entry)
-        mock_reload.assert_called_once_with(mock_config_entry.entry_id)
+        assert mock_reload.call_count == 1
+        assert mock_reload.call_args == ((mock_config_entry.entry_id,),)
+        mock_dispatch.assert_not_called()
@@ -1,153 +1,415 @@
+import asyncio
 from unittest.mock import AsyncMock, patch
 
+import custom_components.control_freak_edidio as integration
 from custom_components.control_freak_edidio import (
-    DOMAIN,
     PLATFORMS,
-    async_reload_entry,
-    async_setup_entry,
     async_unload_entry,
     options_update_listener,
 )
-from custom_components.control_freak_edidio.const import CONF_HOST, CONF_PORT
+from custom_components.control_freak_edidio.const import (
+    CONF_HOST,
+    CONF_LIGHT_ADDRESS,
+    CONF_LIGHT_ID,
+    CONF_LIGHT_LINE,
+    CONF_LIGHT_NAME,
+    CONF_LIGHT_PROTOCOL,
+    CONF_LIGHTS,
+    CONF_PORT,
+    DOMAIN,
+    PROTOCOL_DALI_DT8_CCT,
+    PROTOCOL_DALI_RGB,
+    PROTOCOL_DALI_RGBW,
+    PROTOCOL_DALI_WHITE,
+    SIGNAL_CONNECTION_STATE,
+)
+from custom_components.control_freak_edidio.light import rgb_to_xy_16bit
+from custom_components.control_freak_edidio.models import EdidioRuntimeData
+from edidio_control_py import eDS10_ProtocolBuffer_pb2 as pb
 from edidio_control_py.exceptions import EDIDIOConnectionError, EDIDIOTimeoutError
 import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
 
-from homeassistant.config_entries import ConfigEntry
+from homeassistant.config_entries import ConfigEntries, ConfigEntryState
 from homeassistant.const import STATE_UNAVAILABLE, Platform
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.typing import ConfigType
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 
 MOCK_HOST = "192.168.1.200"
 MOCK_PORT = 1234
 
-@pytest.fixture
-def mock_edidio_client(mocker):
-    mock_client_instance = AsyncMock()
-    mock_client_instance.connect = AsyncMock(return_value=None)
-    mock_client_instance.disconnect = AsyncMock(return_value=None)
-
-    mock_client_class = mocker.patch(
-        "custom_components.control_freak_edidio.EdidioClient",
-        return_value=mock_client_instance,
-    )
-    return mock_client_class, mock_client_instance
+LIGHT_KITCHEN = {
+    CONF_LIGHT_ID: "kitchen_id",
+    CONF_LIGHT_NAME: "Kitchen",
+    CONF_LIGHT_ADDRESS: 1,
+    CONF_LIGHT_PROTOCOL: PROTOCOL_DALI_WHITE,
+    CONF_LIGHT_LINE: 1,
+}
+LIGHT_HALL = {
+    CONF_LIGHT_ID: "hall_id",
+    CONF_LIGHT_NAME: "Hall",
+    CONF_LIGHT_ADDRESS: 5,
+    CONF_LIGHT_PROTOCOL: PROTOCOL_DALI_WHITE,
+    CONF_LIGHT_LINE: 1,
+}
+
+# ConfigEntries methods patched around setup and unload
+_FORWARD = "async_forward_entry_setups"
+_UNLOAD = "async_unload_platforms"
+
+# Shared constant-result mocks, reset by each test before patching them in
+_ASYNC_TRUE = AsyncMock(return_value=True)
+_ASYNC_FALSE = AsyncMock(return_value=False)
+
+# Connection errors raised by the first connect attempt in the failure tests
+_CONN_ERR = EDIDIOConnectionError("Mock connection error")
+_TIMEOUT_ERR = EDIDIOTimeoutError("Mock connection error")
 
 @pytest.fixture
-def mock_config_entry(hass: HomeAssistant):
-    entry = ConfigEntry(
-        version=1,
-        minor_version=1,
+async def mock_config_entry(hass: HomeAssistant, enable_custom_integrations):
+    """Add a config entry to Home Assistant and unload it again after the test."""
+    entry = MockConfigEntry(
         domain=DOMAIN,
         title="Test Control Freak",
         data={CONF_HOST: MOCK_HOST, CONF_PORT: MOCK_PORT},
-        options={},
-        source="user",
         unique_id=f"{MOCK_HOST}-{MOCK_PORT}",
-        discovery_keys=[],
-        subentries_data={},
     )
-    return entry
+    entry.add_to_hass(hass)
+    yield entry
+    # Unloading cancels the connection check timer and background tasks
+    if entry.state is ConfigEntryState.LOADED:
+        with patch.object(ConfigEntries, _UNLOAD, new=_ASYNC_TRUE):
+            assert await hass.config_entries.async_unload(entry.entry_id)
 
 async def test_async_setup_entry_success(hass: HomeAssistant, mock_edidio_client, mock_config_entry):
     mock_client_class, mock_client_instance = mock_edidio_client
-    mock_client_instance.connect.side_effect = None
+    mock_client_instance.side_effect = None
+
+    _ASYNC_TRUE.reset_mock()
 
-    with patch(
-        "homeassistant.config_entries.ConfigEntries.async_forward_entry_setups",
-        return_value=True,
-    ) as mock_forward_setups:
-        result = await async_setup_entry(hass, mock_config_entry)
+    with patch.object(ConfigEntries, _FORWARD, new=_ASYNC_TRUE) as mock_forward_setups:
+        result = await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done(wait_background_tasks=True)
 
         assert result is True
-        mock_client_class.assert_called_once_with(MOCK_HOST, MOCK_PORT)
-        mock_client_instance.connect.assert_called_once()
-        mock_forward_setups.assert_called_once_with(mock_config_entry, PLATFORMS)
+        assert mock_config_entry.state is ConfigEntryState.LOADED
+        assert mock_client_class.call_count == 1
+        assert mock_client_class.call_args == ((MOCK_HOST, MOCK_PORT),)
+        assert mock_client_instance.calls == ["connect"]
+        assert mock_forward_setups.call_count == 1
+        assert mock_forward_setups.call_args == ((mock_config_entry, PLATFORMS),)
 
-        assert DOMAIN in hass.data
-        assert mock_config_entry.entry_id in hass.data[DOMAIN]
-        assert hass.data[DOMAIN][mock_config_entry.entry_id]["client"] is mock_client_instance
-        assert hass.data[DOMAIN][mock_config_entry.entry_id]["config_entry"] is mock_config_entry
+        runtime_data = mock_config_entry.runtime_data
+        assert runtime_data.client is mock_client_instance
+        assert runtime_data.config_entry is mock_config_entry
 
-@pytest.mark.parametrize("exception_type", [EDIDIOConnectionError, EDIDIOTimeoutError])
-async def test_async_setup_entry_connection_failure(hass: HomeAssistant, mock_edidio_client, mock_config_entry, exception_type):
+@pytest.mark.parametrize("exc", [_CONN_ERR, _TIMEOUT_ERR])
+async def test_async_setup_entry_connection_failure(hass: HomeAssistant, mock_edidio_client, mock_config_entry, exc):
     mock_client_class, mock_client_instance = mock_edidio_client
-    mock_client_instance.connect.side_effect = exception_type("Mock connection error")
+    mock_client_instance.side_effect = [exc, None]
 
-    with patch(
-        "homeassistant.config_entries.ConfigEntries.async_forward_entry_setups",
-        return_value=True,
-    ) as mock_forward_setups:
-        result = await async_setup_entry(hass, mock_config_entry)
+    _ASYNC_TRUE.reset_mock()
+
+    with (
+        patch.object(ConfigEntries, _FORWARD, new=_ASYNC_TRUE) as mock_forward_setups,
+        patch.object(integration, "_sleep", AsyncMock()) as mock_sleep,
+    ):
+        result = await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done(wait_background_tasks=True)
 
         assert result is True
-        mock_client_class.assert_called_once_with(MOCK_HOST, MOCK_PORT)
-        mock_client_instance.connect.assert_called_once()
-        mock_forward_setups.assert_called_once_with(mock_config_entry, PLATFORMS)
+        assert mock_config_entry.state is ConfigEntryState.LOADED
+        assert mock_client_class.call_count == 1
+        assert mock_client_class.call_args == ((MOCK_HOST, MOCK_PORT),)
+        assert mock_client_instance.calls == ["connect", "connect"]
+        assert mock_sleep.call_count == 1
+        assert mock_sleep.call_args == ((1,),)
+        assert mock_forward_setups.call_count == 1
+        assert mock_forward_setups.call_args == ((mock_config_entry, PLATFORMS),)
 
-        assert DOMAIN in hass.data
-        assert mock_config_entry.entry_id in hass.data[DOMAIN]
-        assert hass.data[DOMAIN][mock_config_entry.entry_id]["client"] is mock_client_instance
+        runtime_data = mock_config_entry.runtime_data
+        assert runtime_data.client is mock_client_instance
+        assert runtime_data.config_entry is mock_config_entry
 
-async def test_async_unload_entry_success(hass: HomeAssistant, mock_edidio_client, mock_config_entry):
+@pytest.fixture
+async def setup_done(hass: HomeAssistant, mock_edidio_client, mock_config_entry):
+    """Set up the config entry and return it with the client stub."""
     _, mock_client_instance = mock_edidio_client
 
-    with patch(
-        "homeassistant.config_entries.ConfigEntries.async_forward_entry_setups",
-        return_value=True,
-    ):
-        await async_setup_entry(hass, mock_config_entry)
-        await hass.async_block_till_done()
+    _ASYNC_TRUE.reset_mock()
+
+    with patch.object(ConfigEntries, _FORWARD, new=_ASYNC_TRUE):
+        await hass.config_entries.async_setup(mock_config_entry.entry_id)
+
+    return mock_config_entry, mock_client_instance
+
+async def test_async_unload_entry(hass: HomeAssistant, setup_done):
+    mock_config_entry, mock_client_instance = setup_done
+
+    _ASYNC_TRUE.reset_mock()
+
+    with patch.object(ConfigEntries, _UNLOAD, new=_ASYNC_TRUE) as mock_unload_platforms:
+        assert await hass.config_entries.async_unload(mock_config_entry.entry_id)
+
+        assert mock_config_entry.state is ConfigEntryState.NOT_LOADED
+        assert mock_unload_platforms.call_count == 1
+        assert mock_unload_platforms.call_args == ((mock_config_entry, PLATFORMS),)
+        assert mock_client_instance.calls.count("disconnect") == 1
+
+async def test_async_unload_entry_platform_unload_failure(hass: HomeAssistant, setup_done):
+    mock_config_entry, mock_client_instance = setup_done
+
+    _ASYNC_FALSE.reset_mock()
 
-    with patch(
-        "homeassistant.config_entries.ConfigEntries.async_unload_platforms",
-        return_value=True,
-    ) as mock_unload_platforms:
+    # Called directly, as a failed unload through the manager leaves the entry
+    # in FAILED_UNLOAD with its timer still running
+    with patch.object(ConfigEntries, _UNLOAD, new=_ASYNC_FALSE) as mock_unload_platforms:
         result = await async_unload_entry(hass, mock_config_entry)
 
-        assert result is True
-        mock_unload_platforms.assert_called_once_with(mock_config_entry, PLATFORMS)
-        mock_client_instance.disconnect.assert_called_once()
-        assert mock_config_entry.entry_id not in hass.data[DOMAIN]
+        assert result is False
+        assert mock_unload_platforms.call_count == 1
+        assert mock_unload_platforms.call_args == ((mock_config_entry, PLATFORMS),)
+        assert mock_client_instance.calls.count("disconnect") == 0
+        assert mock_config_entry.runtime_data.client is mock_client_instance
 
-async def test_async_unload_entry_platform_unload_failure(hass: HomeAssistant, mock_edidio_client, mock_config_entry):
+async def test_options_update_listener(
+    hass: HomeAssistant, mock_edidio_client, mock_config_entry
+):
     _, mock_client_instance = mock_edidio_client
+    mock_client_instance.host = MOCK_HOST
+    mock_client_instance.port = MOCK_PORT
+    mock_config_entry.runtime_data = EdidioRuntimeData(
+        client=mock_client_instance, config_entry=mock_config_entry
+    )
 
-    with patch(
-        "homeassistant.config_entries.ConfigEntries.async_forward_entry_setups",
-        return_value=True,
+    with (
+        patch.object(ConfigEntries, "async_reload", AsyncMock()) as mock_reload,
+        patch.object(integration, "async_dispatcher_send") as mock_dispatch,
     ):
-        await async_setup_entry(hass, mock_config_entry)
-        await hass.async_block_till_done()
+        await options_update_listener(hass, mock_config_entry)
+        mock_reload.assert_not_called()
+        assert mock_dispatch.call_count == 1
+        assert mock_dispatch.call_args == (
+            (hass, f"{DOMAIN}_lights_updated_{mock_config_entry.entry_id}"),
+        )
 
-    with patch(
-        "homeassistant.config_entries.ConfigEntries.async_unload_platforms",
-        return_value=False,
-    ) as mock_unload_platforms:
-        result = await async_unload_entry(hass, mock_config_entry)
+async def test_options_update_listener_connection_changed(
+    hass: HomeAssistant, mock_edidio_client, mock_config_entry
+):
+    _, mock_client_instance = mock_edidio_client
+    mock_client_instance.host = "192.168.1.201"
+    mock_client_instance.port = MOCK_PORT
+    mock_config_entry.runtime_data = EdidioRuntimeData(
+        client=mock_client_instance, config_entry=mock_config_entry
+    )
 
-        assert result is False
-        mock_unload_platforms.assert_called_once_with(mock_config_entry, PLATFORMS)
-        mock_client_instance.disconnect.assert_not_called()
-        assert mock_config_entry.entry_id in hass.data[DOMAIN]
-
-async def test_async_reload_entry(hass: HomeAssistant, mock_edidio_client, mock_config_entry):
-    _mock_client_class, _mock_client_instance = mock_edidio_client
-
-    with patch(
-        "custom_components.control_freak_edidio.async_unload_entry",
-        AsyncMock(return_value=True),
-    ) as mock_unload:
-        with patch(
-            "custom_components.control_freak_edidio.async_setup_entry",
-            AsyncMock(return_value=True),
-        ) as mock_setup:
-            await async_reload_entry(hass, mock_config_entry)
-            mock_unload.assert_called_once_with(hass, mock_config_entry)
-            mock_setup.assert_called_once_with(hass, mock_config_entry)
-
-async def test_options_update_listener(hass: HomeAssistant, mock_config_entry):
-    with patch(
-        "homeassistant.config_entries.ConfigEntries.async_reload", AsyncMock()
-    ) as mock_reload:
+    with (
+        patch.object(ConfigEntries, "async_reload", AsyncMock()) as mock_reload,
+        patch.object(integration, "async_dispatcher_send") as mock_dispatch,
+    ):
         await options_update_listener(hass, mock_config_entry)
-        mock_reload.assert_called_once_with(mock_config_entry.entry_id)
+        assert mock_reload.call_count == 1
+        assert mock_reload.call_args == ((mock_config_entry.entry_id,),)
+        mock_dispatch.assert_not_called()
+
+@pytest.fixture
+async def loaded_entry(hass: HomeAssistant, enable_custom_integrations, mock_edidio_client):
+    """Set up a config entry holding the kitchen light through Home Assistant."""
+    _, mock_client_instance = mock_edidio_client
+    mock_client_instance.host = MOCK_HOST
+    mock_client_instance.port = MOCK_PORT
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_HOST: MOCK_HOST, CONF_PORT: MOCK_PORT},
+        options={CONF_LIGHTS: [LIGHT_KITCHEN]},
+        unique_id=f"{MOCK_HOST}-{MOCK_PORT}",
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    yield entry
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+async def _async_set_lights(hass: HomeAssistant, entry, lights):
+    """Replace the entry's lights the way the options flow does."""
+    hass.config_entries.async_update_entry(entry, options={**entry.options, CONF_LIGHTS: lights})
+    await hass.async_block_till_done()
+
+def _sent_frames(client):
+    """Return every framed command sent to the client stub, in order."""
+    return [frame for method, payload in client.sent for frame in (payload if method == "send_dali_commands_sequence" else [payload])]
+
+def _dali_addresses(frames):
+    """Return the DALI address each framed command is sent to."""
+    return [pb.EdidioMessage.FromString(frame[3:]).dali_message.address for frame in frames]
+
+async def test_lights_updated_adds_light(hass: HomeAssistant, loaded_entry, mock_edidio_client):
+    mock_client_class, _ = mock_edidio_client
+
+    await _async_set_lights(hass, loaded_entry, [LIGHT_KITCHEN, LIGHT_HALL])
+
+    assert hass.states.get("light.kitchen") is not None
+    assert hass.states.get("light.hall") is not None
+    assert er.async_get(hass).async_get_entity_id("light", DOMAIN, f"{DOMAIN}_hall_id") == "light.hall"
+    # Only the lights changed, so the client was kept rather than reloaded
+    assert mock_client_class.call_count == 1
+
+async def test_lights_updated_removes_light(hass: HomeAssistant, loaded_entry, mock_edidio_client):
+    mock_client_class, _ = mock_edidio_client
+    entity_registry = er.async_get(hass)
+    assert entity_registry.async_get("light.kitchen") is not None
+
+    await _async_set_lights(hass, loaded_entry, [])
+
+    assert hass.states.get("light.kitchen") is None
+    assert entity_registry.async_get("light.kitchen") is None
+    assert mock_client_class.call_count == 1
+
+async def test_lights_updated_edits_light_in_place(hass: HomeAssistant, loaded_entry, mock_edidio_client):
+    mock_client_class, mock_client_instance = mock_edidio_client
+    entity_registry = er.async_get(hass)
+    registry_entry = entity_registry.async_get("light.kitchen")
+
+    edited = {
+        **LIGHT_KITCHEN,
+        CONF_LIGHT_NAME: "Kitchen Strip",
+        CONF_LIGHT_ADDRESS: 10,
+        CONF_LIGHT_PROTOCOL: PROTOCOL_DALI_RGB,
+    }
+    await _async_set_lights(hass, loaded_entry, [edited])
+
+    # Same entity and registry entry, with the edited name and protocol
+    state = hass.states.get("light.kitchen")
+    assert state.attributes["friendly_name"] == "Kitchen Strip"
+    assert state.attributes["supported_color_modes"] == ["rgb"]
+    assert entity_registry.async_get("light.kitchen").id == registry_entry.id
+    assert mock_client_class.call_count == 1
+
+    # Commands go to the edited address, one per RGB channel
+    await hass.services.async_call("light", "turn_on", {"entity_id": "light.kitchen"}, blocking=True)
+    assert _dali_addresses(_sent_frames(mock_client_instance)) == [10, 11, 12]
+
+async def test_dali_rgbw_turn_on_sends_one_paced_sequence(hass: HomeAssistant, loaded_entry, mock_edidio_client):
+    _, mock_client_instance = mock_edidio_client
+    await _async_set_lights(hass, loaded_entry, [{**LIGHT_KITCHEN, CONF_LIGHT_ADDRESS: 20, CONF_LIGHT_PROTOCOL: PROTOCOL_DALI_RGBW}])
+
+    await hass.services.async_call("light", "turn_on", {"entity_id": "light.kitchen", "rgbw_color": (255, 0, 128, 64), "brightness": 255}, blocking=True)
+
+    # All four channels go through the client's paced sequence, in R, G, B, W order
+    ((method, frames),) = mock_client_instance.sent
+    assert method == "send_dali_commands_sequence"
+    assert _dali_addresses(frames) == [20, 21, 22, 23]
+    red, green, blue, white = (pb.EdidioMessage.FromString(frame[3:]).dali_message.arg for frame in frames)
+    assert green == 0
+    assert red > blue > white > 0
+
+async def test_connection_state_sets_availability(hass: HomeAssistant, loaded_entry):
+    signal = f"{SIGNAL_CONNECTION_STATE}_{loaded_entry.entry_id}"
+    assert hass.states.get("light.kitchen").state == "off"
+
+    async_dispatcher_send(hass, signal, False)
+    await hass.async_block_till_done()
+    assert hass.states.get("light.kitchen").state == STATE_UNAVAILABLE
+
+    async_dispatcher_send(hass, signal, True)
+    await hass.async_block_till_done()
+    assert hass.states.get("light.kitchen").state == "off"
+
+async def test_grouped_turn_off_sends_each_light_concurrently(hass: HomeAssistant, loaded_entry, mock_edidio_client):
+    _, mock_client_instance = mock_edidio_client
+    strip = {**LIGHT_KITCHEN, CONF_LIGHT_ID: "strip_id", CONF_LIGHT_NAME: "Strip", CONF_LIGHT_ADDRESS: 10, CONF_LIGHT_PROTOCOL: PROTOCOL_DALI_RGB}
+    await _async_set_lights(hass, loaded_entry, [LIGHT_KITCHEN, LIGHT_HALL, strip])
+
+    in_flight = peak = 0
+    record_sequence = mock_client_instance.send_dali_commands_sequence
+
+    async def _slow_sequence(commands):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        await record_sequence(commands)
+
+    with patch.object(mock_client_instance, "send_dali_commands_sequence", _slow_sequence):
+        await hass.services.async_call("light", "turn_off", {"entity_id": ["light.kitchen", "light.hall", "light.strip"]}, blocking=True)
+
+    # One paced sequence per light, all in flight at once rather than one after another
+    assert [method for method, _ in mock_client_instance.sent] == ["send_dali_commands_sequence"] * 3
+    assert sorted(_dali_addresses(frames) for _, frames in mock_client_instance.sent) == [[1], [5], [10, 11, 12]]
+    assert peak == 3
+
+async def _async_turn_on_kitchen(hass: HomeAssistant, brightness):
+    await hass.services.async_call("light", "turn_on", {"entity_id": "light.kitchen", "brightness": brightness}, blocking=True)
+
+async def test_turn_on_skips_unchanged_state(hass: HomeAssistant, loaded_entry, mock_edidio_client):
+    _, mock_client_instance = mock_edidio_client
+
+    await _async_turn_on_kitchen(hass, 100)
+    await _async_turn_on_kitchen(hass, 100)
+
+    # Already on at this brightness, so the second call sends nothing
+    assert len(mock_client_instance.sent) == 1
+    state = hass.states.get("light.kitchen")
+    assert state.state == "on"
+    assert state.attributes["brightness"] == 100
+
+async def test_turn_on_retries_after_failed_send(hass: HomeAssistant, loaded_entry, mock_edidio_client):
+    _, mock_client_instance = mock_edidio_client
+    await _async_turn_on_kitchen(hass, 50)
+
+    mock_client_instance.send_side_effect = _CONN_ERR
+    await _async_turn_on_kitchen(hass, 100)
+    assert hass.states.get("light.kitchen").state == STATE_UNAVAILABLE
+
+    # Back online, the light reports what the device last received
+    mock_client_instance.send_side_effect = None
+    async_dispatcher_send(hass, f"{SIGNAL_CONNECTION_STATE}_{loaded_entry.entry_id}", True)
+    await hass.async_block_till_done()
+    assert hass.states.get("light.kitchen").attributes["brightness"] == 50
+
+    # The same request must reach the device rather than be skipped
+    await _async_turn_on_kitchen(hass, 100)
+
+    assert len(mock_client_instance.sent) == 3
+    state = hass.states.get("light.kitchen")
+    assert state.state == "on"
+    assert state.attributes["brightness"] == 100
+
+# Expected values are the output of the original, unoptimized conversion
+@pytest.mark.parametrize(
+    ("rgb", "expected"),
+    [
+        ((0, 0, 0), (0, 0)),
+        ((255, 0, 0), (48168, 17366)),
+        ((0, 255, 0), (7536, 54131)),
+        ((0, 0, 255), (10289, 1179)),
+        ((255, 255, 255), (20494, 21562)),
+        ((255, 128, 0), (40851, 23986)),
+        ((12, 200, 90), (8281, 43510)),
+        # Channels of at most 1 are read as already normalized, as before
+        ((1, 1, 1), (20494, 21562)),
+        ((0.0, 0.0, 0.0), (0, 0)),
+        ((1.0, 0.0, 0.0), (48168, 17366)),
+        ((0.5, 0.25, 0.75), (18193, 7337)),
+    ],
+)
+def test_rgb_to_xy_16bit_matches_baseline(rgb, expected):
+    assert rgb_to_xy_16bit(*rgb) == expected
+
+async def test_dt8_cct_reports_requested_kelvin(hass: HomeAssistant, loaded_entry, mock_edidio_client):
+    _, mock_client_instance = mock_edidio_client
+    await _async_set_lights(hass, loaded_entry, [{**LIGHT_KITCHEN, CONF_LIGHT_PROTOCOL: PROTOCOL_DALI_DT8_CCT}])
+
+    await hass.services.async_call("light", "turn_on", {"entity_id": "light.kitchen", "color_temp_kelvin": 2700}, blocking=True)
+    # Reported as requested, not converted back from the rounded mireds
+    assert hass.states.get("light.kitchen").attributes["color_temp_kelvin"] == 2700
+
+    # A failed send restores the Kelvin of the mireds the device last received
+    mock_client_instance.send_side_effect = _CONN_ERR
+    await hass.services.async_call("light", "turn_on", {"entity_id": "light.kitchen", "color_temp_kelvin": 5000}, blocking=True)
+    mock_client_instance.send_side_effect = None
+    async_dispatcher_send(hass, f"{SIGNAL_CONNECTION_STATE}_{loaded_entry.entry_id}", True)
+    await hass.async_block_till_done()
+    assert hass.states.get("light.kitchen").attributes["color_temp_kelvin"] == 1000000 // (1000000 // 2700)